@@ -12,45 +12,83 @@ st.set_page_config(
 )
 
 # Auto-load user from database if not in session
-import os
 from src.database.database import get_db
 from src.database.models import User, UserProfile
 from src.database.auto_migrate import auto_migrate
 
-# Run auto-migrations on startup (safe to run multiple times)
-if "migrations_run" not in st.session_state:
-    try:
-        migrations = auto_migrate()
-        if migrations:
-            print(f"✓ Applied {len(migrations)} migrations: {migrations}")
-        st.session_state.migrations_run = True
-    except Exception as e:
-        print(f"Warning: Auto-migration failed: {e}")
-
-# Check if Strava was just connected via OAuth
-if os.path.exists("data/.strava_connected") and "user" not in st.session_state:
-    with open("data/.strava_connected", "r") as f:
-        user_id = int(f.read().strip())
+# Run auto-migrations on startup (lru_cached — runs once per process, not per session)
+try:
+    migrations = auto_migrate()
+    if migrations:
+        print(f"✓ Applied {len(migrations)} migrations: {migrations}")
+except Exception as e:
+    print(f"Warning: Auto-migration failed: {e}")
+
+@st.cache_data
+def get_strava_auth_url() -> str:
+    """Authorization URL is deterministic per deployment — build it once"""
+    from src.strava.auth import StravaAuth
+    return StravaAuth().get_authorization_url()
+
+
+@st.cache_data(ttl=60)
+def load_user_and_profile(user_id: int):
+    """Load user + profile in one joined SELECT — cached so reruns skip SQLite entirely"""
     with get_db() as db:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            st.session_state.user = {"id": user.id, "name": user.name}
-            st.session_state.strava_connected = True
-    os.remove("data/.strava_connected")
+        row = (
+            db.query(User, UserProfile)
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not row:
+            return None, None
+        user, profile = row
+        user_dict = {"id": user.id, "name": user.name}
+        profile_dict = {
+            "ftp": profile.ftp,
+            "ctl": profile.ctl,
+            "atl": profile.atl,
+            "tsb": profile.tsb,
+        } if profile else None
+        return user_dict, profile_dict
 
-# Multi-user: don't auto-load any user — each user must connect via Strava OAuth
 
-# Load user profile if connected
-if "user" in st.session_state and "profile" not in st.session_state:
+@st.cache_resource(ttl=2)
+def _poll_just_connected():
+    """
+    Check for (and consume) the post-OAuth flag — cached so the poll costs at
+    most one SELECT per 2s process-wide instead of one per rerun
+    """
     with get_db() as db:
-        profile = db.query(UserProfile).filter(UserProfile.user_id == st.session_state.user["id"]).first()
+        just_connected_user = db.query(User).filter(User.just_connected == True).first()
+        if just_connected_user:
+            just_connected_user.just_connected = False  # consume the flag
+            return {"id": just_connected_user.id, "name": just_connected_user.name}
+    return None
+
+
+def bootstrap_session_state():
+    """Populate session state with at most one DB session per rerun"""
+    # Check if Strava was just connected via OAuth (flag set by oauth_server.py)
+    if "user" not in st.session_state:
+        boot = _poll_just_connected()
+        if boot:
+            _poll_just_connected.clear()  # one-shot — don't hand the same user to other sessions
+            st.cache_data.clear()  # fresh OAuth write — drop any stale cached lookups
+            st.session_state.user = boot
+            st.session_state.strava_connected = True
+
+    # Multi-user: don't auto-load any user — each user must connect via Strava OAuth
+
+    # Load user profile if connected
+    if "user" in st.session_state and "profile" not in st.session_state:
+        _, profile = load_user_and_profile(st.session_state.user["id"])
         if profile:
-            st.session_state.profile = {
-                "ftp": profile.ftp,
-                "ctl": profile.ctl,
-                "atl": profile.atl,
-                "tsb": profile.tsb,
-            }
+            st.session_state.profile = profile
+
+
+bootstrap_session_state()
 
 # Sidebar
 with st.sidebar:
@@ -73,25 +111,14 @@ st.markdown("---")
 if "user" not in st.session_state or not st.session_state.get("strava_connected"):
     st.subheader("🔗 Get Started")
     st.info("Connect your Strava account to sync your training data and get personalized workouts.")
-    from src.strava.auth import StravaAuth
-    auth_url = StravaAuth().get_authorization_url()
+    # Native link button — no raw-HTML sanitizer pass or DOM diff per rerun
+    st.markdown(
+        "<style>.stLinkButton a {background:#FC4C02;color:white;font-weight:bold}</style>",
+        unsafe_allow_html=True,
+    )
     col1, col2, col3 = st.columns([1, 1, 1])
     with col2:
-        st.markdown(
-            f'<a href="{auth_url}" target="_self">'
-            '<button style="'
-            'background-color: #FC4C02; '
-            'color: white; '
-            'padding: 15px 32px; '
-            'font-size: 20px; '
-            'border: none; '
-            'border-radius: 8px; '
-            'cursor: pointer; '
-            'width: 100%;'
-            '">🚴 Connect Strava</button>'
-            '</a>',
-            unsafe_allow_html=True
-        )
+        st.link_button("🚴 Connect Strava", get_strava_auth_url(), use_container_width=True)
 else:
     st.success(f"✅ Connected as {st.session_state.user.get('name', 'Cyclist')}")
     st.info("Go to **Dashboard** in the sidebar to sync your activities.")
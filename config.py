@@ -1,6 +1,7 @@
 """
 Central configuration management for Trainer Agent
 """
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -44,5 +45,14 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Cached settings accessor — .env parsing and Pydantic validation happen
+    exactly once per process. Prefer this over constructing Settings() directly.
+    """
+    return Settings()
+
+
+# Global settings instance (back-compat for existing `from config import settings`)
+settings = get_settings()
@@ -5,7 +5,7 @@ Run this alongside Streamlit
 from flask import Flask, request, redirect
 import webbrowser
 from src.strava.auth import StravaAuth
-from src.database.database import get_db
+from src.database.database import get_write_db
 from src.database.models import User
 import threading
 
@@ -25,20 +25,16 @@ def strava_callback():
         tokens = auth.exchange_code_for_token(code)
 
         # Store in database
-        with get_db() as db:
+        with get_write_db() as db:
             user = User(
                 name="Strava User",
                 strava_access_token=tokens["access_token"],
                 strava_refresh_token=tokens["refresh_token"],
                 strava_token_expires_at=tokens["expires_at"],
+                just_connected=True,  # flag for Streamlit to pick up (no marker file)
             )
             db.add(user)
             db.commit()
-            user_id = user.id
-
-        # Write success marker file for Streamlit to detect
-        with open("data/.strava_connected", "w") as f:
-            f.write(str(user_id))
 
         return """
         <html>
@@ -67,7 +63,12 @@ def authorize():
     return redirect(auth_url)
 
 def run_server():
-    app.run(port=5000, debug=False)
+    try:
+        from waitress import serve
+        serve(app, host="127.0.0.1", port=5000, threads=4)
+    except ImportError:
+        # Fallback to Flask's dev server, but at least handle callbacks in parallel
+        app.run(port=5000, debug=False, threaded=True)
 
 if __name__ == "__main__":
     print("=" * 60)
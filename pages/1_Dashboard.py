@@ -2,32 +2,32 @@
 Dashboard — Training overview + Strava sync (merged from Analytics)
 """
 import re
-import sys
-import json
-from pathlib import Path
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import streamlit as st
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Pages run in the app.py process, whose directory (the project root) is
+# already on sys.path — no per-page path bootstrapping needed
 
-from src.database.database import get_db
+from src.database.database import get_db, get_read_db, weekly_tss
 from src.database.models import User, Activity, UserProfile
-from src.strava.auth import StravaAuth
-from src.strava.client import StravaDataClient
-from src.strava.data_processor import StravaDataProcessor
-from src.strava.metrics import TrainingMetrics
-from src.strava.power_profile import PowerProfileAnalyzer
-from src.strava.power_curve_calculator import (
-    calculate_best_efforts_from_activities,
-    update_power_curve_with_pr_tracking,
-)
-from src.visualization.charts import (
-    create_pmc_chart,
-    create_weekly_tss_chart,
-    create_zone_distribution_chart,
-    create_power_curve_spider_chart,
+from src.database.queries import (
+    PROFILE_STMT,
+    RECENT_7D_STMT,
+    RECENT_90D_STMT,
+    RECENT_ACTIVITIES_STMT,
+    WEEKLY_AGG_STMT,
 )
+from src.strava.auth import StravaAuth
+
+# pandas / plotly / chart helpers and the Strava processing stack are imported
+# lazily inside the branches that need them — a plain rerun (no sync, no chart)
+# pays only the imports above
+
+_CODE_RE = re.compile(r"code=([^&]+)")  # compiled once, not per rerun
 
 st.set_page_config(page_title="Dashboard", page_icon="🏠", layout="wide")
 st.title("🏠 Dashboard")
@@ -37,8 +37,229 @@ if st.session_state.pop("just_connected", False):
 
 # Multi-user: session identifies the user — no auto-load from DB
 
+@st.cache_resource
+def _get_auth() -> StravaAuth:
+    """One StravaAuth per process — keeps its pooled HTTP session alive across reruns"""
+    return StravaAuth()
+
+
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Small shared pool for background work (initial sync after OAuth)"""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_strava_client(access_token: str):
+    """One StravaDataClient per token — reruns reuse its keep-alive HTTP
+    session; token rotation keys a fresh client. No spinner: this is also
+    called from the background sync thread, which has no script context"""
+    from src.strava.client import StravaDataClient
+
+    return StravaDataClient(access_token)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_strava_activities(user_id: int, token: str, after_iso: str, limit: int):
+    """Memoize the Strava activity list per (user, day-bucketed window) — a
+    repeat sync inside the TTL skips the network entirely. The post-sync cache
+    clear leaves this memo alone; 'Force refresh' drops it explicitly."""
+    return _get_strava_client(token).get_activities(
+        after=datetime.fromisoformat(after_iso), limit=limit
+    )
+
+
+def _sync_training_data(uid: int, token: str, days: int, progress_callback=None):
+    """Fetch, process and store Strava activities, then refresh fitness metrics
+
+    Pure data path — no Streamlit widgets — so it runs either inline under the
+    sync buttons' spinner or on the background executor right after the OAuth
+    exchange. Returns a summary dict for the caller to display.
+    """
+    from sqlalchemy import func
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    from src.strava.data_processor import StravaDataProcessor
+    from src.strava.metrics import TrainingMetrics
+    from src.strava.power_profile import PowerProfileAnalyzer
+    from src.strava.power_curve_calculator import (
+        calculate_best_efforts_from_activities,
+        update_power_curve_with_pr_tracking,
+    )
+
+    summary = {"found": 0, "new": 0, "updated": 0, "skipped": 0,
+               "default_ftp": False, "metrics": None, "profile": None}
+
+    with get_db() as db:
+        profile = db.query(UserProfile).filter(UserProfile.user_id == uid).first()
+        if not profile:
+            # Create a default profile so sync can proceed
+            profile = UserProfile(user_id=uid, ftp=200.0)
+            db.add(profile)
+            db.commit()
+            summary["default_ftp"] = True
+        after_date = datetime.now() - timedelta(days=days)
+        if days <= 7:
+            # Differential import: only ask Strava for activities newer than
+            # the latest one stored — an empty page is a cheap response
+            last_synced = db.query(func.max(Activity.start_date)).filter(
+                Activity.user_id == uid
+            ).scalar()
+            if last_synced and last_synced > after_date:
+                after_date = last_synced
+
+    client = _get_strava_client(token)
+    # Day-bucketed window key keeps repeat syncs on the memo
+    activities = _fetch_strava_activities(
+        uid, token,
+        after_date.replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+        200 if days == 90 else 50,
+    )
+    if not activities:
+        return summary
+    summary["found"] = len(activities)
+
+    with get_db() as db:
+        profile = db.query(UserProfile).filter(UserProfile.user_id == uid).first()
+        processor = StravaDataProcessor(ftp=profile.ftp)
+
+        # Skip activities already synced with zone data — stream fetches are
+        # the rate-limited cost, and those rows are already complete
+        zone_total = (
+            Activity.time_zone1 + Activity.time_zone2 + Activity.time_zone3
+            + Activity.time_zone4 + Activity.time_zone5 + Activity.time_zone6
+            + Activity.time_zone7
+        )
+        synced_ids = {
+            str(sid) for (sid,) in db.query(Activity.strava_activity_id).filter(
+                Activity.user_id == uid,
+                Activity.strava_activity_id.in_([a["id"] for a in activities]),
+                zone_total > 0,
+            ).all()
+        }
+        to_process = [a for a in activities if str(a["id"]) not in synced_ids]
+        summary["skipped"] = len(activities) - len(to_process)
+
+        # Progress is driven by the stream-fetch pool, throttled to ~20
+        # updates regardless of activity count
+        _on_progress = None
+        if progress_callback and to_process:
+            _step = max(1, len(to_process) // 20)
+
+            def _on_progress(done, total):
+                if done % _step == 0 or done == total:
+                    progress_callback(done / total)
+
+        processed = processor.process_activities_batch(
+            to_process, fetch_streams=True, client=client,
+            progress_callback=_on_progress,
+        ) if to_process else []
+
+        # One SELECT for the new/updated split + a single
+        # INSERT ... ON CONFLICT DO UPDATE for the whole batch
+        # (backed by the UNIQUE constraint on strava_activity_id)
+        existing_ids = {
+            str(sid) for (sid,) in db.query(Activity.strava_activity_id).filter(
+                Activity.strava_activity_id.in_([act["id"] for act in processed])
+            ).all()
+        }
+
+        rows = [
+            dict(
+                user_id=uid, strava_activity_id=str(act["id"]),
+                name=act["name"], activity_type=act["type"],
+                start_date=act["start_date"], duration=act["moving_time"],
+                distance=act["distance"], average_watts=act.get("average_watts"),
+                normalized_power=act.get("normalized_power"),
+                tss=act.get("tss"), intensity_factor=act.get("intensity_factor"),
+                time_zone1=act.get("time_zone1", 0), time_zone2=act.get("time_zone2", 0),
+                time_zone3=act.get("time_zone3", 0), time_zone4=act.get("time_zone4", 0),
+                time_zone5=act.get("time_zone5", 0), time_zone6=act.get("time_zone6", 0),
+                time_zone7=act.get("time_zone7", 0),
+            )
+            for act in processed
+        ]
+        if rows:
+            stmt = sqlite_insert(Activity).values(rows)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[Activity.strava_activity_id],
+                set_={
+                    col: stmt.excluded[col]
+                    for col in rows[0]
+                    if col not in ("user_id", "strava_activity_id")
+                },
+            ))
+        summary["new"] = sum(1 for act in processed if str(act["id"]) not in existing_ids)
+        summary["updated"] = len(processed) - summary["new"]
+
+        db.commit()
+
+        # Recalc CTL/ATL/TSB — single tuple-projection scan shared with the
+        # power-curve computation below. Both consumers only look at the last
+        # 90 days, so the range filter runs in SQL (an index range scan on
+        # ix_act_user_date) instead of pulling the full history
+        three_months_ago = datetime.now() - timedelta(days=90)
+        acts_q = db.query(
+            Activity.start_date, Activity.tss, Activity.max_watts,
+            Activity.average_watts, Activity.duration,
+        ).filter(
+            Activity.user_id == uid,
+            Activity.start_date >= three_months_ago,
+        ).yield_per(500)
+
+        # Single streaming pass feeds both consumers — rows arrive in
+        # 500-tuple batches instead of one big list
+        metrics_input, recent_acts_data = [], []
+        for a in acts_q:
+            metrics_input.append({"start_date": a.start_date, "tss": a.tss})
+            if a.max_watts and a.max_watts > 0:
+                recent_acts_data.append({
+                    "max_watts": a.max_watts,
+                    "average_watts": a.average_watts,
+                    "duration": a.duration,
+                    "start_date": a.start_date,
+                })
+
+        metrics = TrainingMetrics.calculate_ctl_atl_tsb(metrics_input)
+        profile.ctl = metrics["ctl"]
+        profile.atl = metrics["atl"]
+        profile.tsb = metrics["tsb"]
+
+        # Power curve
+        if recent_acts_data:
+            best_efforts = calculate_best_efforts_from_activities(recent_acts_data)
+            for attr, key in [("best_5s","5s"),("best_15s","15s"),("best_30s","30s"),
+                              ("best_1min","1min"),("best_5min","5min"),
+                              ("best_20min","20min"),("best_60min","60min")]:
+                setattr(profile, attr, best_efforts.get(key))
+            all_time = {k: getattr(profile, f"pr_{k.replace('s','s').replace('min','min')}", 0) or 0
+                       for k in ["5s","15s","30s","1min","5min","20min","60min"]}
+            updated_pr = update_power_curve_with_pr_tracking(best_efforts, all_time)
+            for attr, key in [("pr_5s","5s"),("pr_15s","15s"),("pr_30s","30s"),
+                              ("pr_1min","1min"),("pr_5min","5min"),
+                              ("pr_20min","20min"),("pr_60min","60min")]:
+                setattr(profile, attr, updated_pr.get(key))
+            analyzer = PowerProfileAnalyzer(ftp=profile.ftp, weight=profile.weight or 75.0)
+            analysis = analyzer.analyze_from_best_efforts(best_efforts)
+            profile.rider_type = analysis["rider_type"]
+            # orjson serializes the float-heavy analysis dict in C
+            import orjson
+
+            profile.power_profile_json = orjson.dumps(analysis).decode()
+
+        db.commit()
+
+        summary["metrics"] = metrics
+        summary["profile"] = {
+            "ftp": profile.ftp, "weight": profile.weight,
+            "ctl": profile.ctl, "atl": profile.atl, "tsb": profile.tsb,
+            "typical_workout_duration": 90,
+        }
+
+    return summary
+
+
 # ── Handle OAuth callback BEFORE tabs (st.stop() in tabs would block this) ────
-_auth = StravaAuth()
+_auth = _get_auth()
 _query_params = st.query_params
 _auth_code = _query_params.get("code")
 if _auth_code and not st.session_state.get("processing_auth") and "user" not in st.session_state:
@@ -69,6 +290,14 @@ if _auth_code and not st.session_state.get("processing_auth") and "user" not in
             st.session_state.user = {"id": _user.id, "name": _user.name}
             st.session_state.strava_connected = True
             st.session_state.just_connected = True
+            # Kick off the initial 3-month sync in the background right away —
+            # the user lands on the dashboard while it runs, instead of having
+            # to click "Full Sync" and watch a spinner. The polling fragment at
+            # the bottom of the page picks up the result.
+            if "sync_future" not in st.session_state:
+                st.session_state.sync_future = _get_executor().submit(
+                    _sync_training_data, _user.id, tokens["access_token"], 90
+                )
         st.query_params.clear()
         st.session_state.pop("processing_auth", None)
         st.rerun()
@@ -103,66 +332,84 @@ def _get_or_create_user(tokens, db):
     return user
 
 
-def _ensure_valid_token(user, db):
-    if user.strava_token_expires_at and user.strava_token_expires_at < datetime.utcnow() + timedelta(minutes=5):
-        auth = StravaAuth()
-        new_tokens = auth.refresh_access_token(user.strava_refresh_token)
-        user.strava_access_token = new_tokens["access_token"]
-        user.strava_refresh_token = new_tokens["refresh_token"]
-        user.strava_token_expires_at = new_tokens["expires_at"]
-        db.commit()
-        return new_tokens["access_token"]
-    return user.strava_access_token
+# Process-level guard so concurrent reruns don't both refresh (and rotate) the
+# same token — the second caller reuses the first one's result
+_TOKEN_LOCK = threading.Lock()
+_FRESH_TOKENS = {}  # user_id -> token dict from the last refresh
 
 
-# ── Tabs ──────────────────────────────────────────────────────────────────────
-tab_overview, tab_sync = st.tabs(["📊 Overview", "🔄 Strava Sync"])
+def _session_token():
+    """Access token cached in session_state — while it is fresh, sync clicks
+    skip the User fetch and the refresh check entirely"""
+    expires_at = st.session_state.get("token_expires_at")
+    if expires_at and expires_at > datetime.utcnow() + timedelta(minutes=5):
+        return st.session_state.get("access_token")
+    return None
 
 
-# ═══════════════════════════════════════════════════════════════════════════════
-# TAB 1 — OVERVIEW
-# ═══════════════════════════════════════════════════════════════════════════════
-with tab_overview:
-    if "user" not in st.session_state:
-        st.info("Connect your Strava account in the **Strava Sync** tab to see your metrics.")
-        st.stop()
+def _ensure_valid_token(user, db):
+    now = datetime.utcnow()
+    if user.strava_token_expires_at and user.strava_token_expires_at < now + timedelta(minutes=5):
+        with _TOKEN_LOCK:
+            cached = _FRESH_TOKENS.get(user.id)
+            if cached and cached["expires_at"] > now + timedelta(minutes=5):
+                new_tokens = cached
+            else:
+                auth = _get_auth()
+                new_tokens = auth.refresh_access_token(user.strava_refresh_token)
+                user.strava_access_token = new_tokens["access_token"]
+                user.strava_refresh_token = new_tokens["refresh_token"]
+                user.strava_token_expires_at = new_tokens["expires_at"]
+                db.commit()
+                _FRESH_TOKENS[user.id] = new_tokens
+        token, expires_at = new_tokens["access_token"], new_tokens["expires_at"]
+    else:
+        token, expires_at = user.strava_access_token, user.strava_token_expires_at
+    # Populate the session cache so the next click takes the fast path
+    st.session_state["access_token"] = token
+    st.session_state["token_expires_at"] = expires_at
+    return token
 
-    with get_db() as db:
-        profile_db = db.query(UserProfile).filter(
-            UserProfile.user_id == st.session_state.user["id"]
-        ).first()
+
+@st.cache_data(ttl=60)
+def _load_overview_data(user_id: int):
+    """Load everything the overview tab needs as plain dicts — cached so widget
+    interactions don't re-hit SQLite on every rerun"""
+    import pandas as pd
+
+    with get_read_db() as db:
+        # Statements are precompiled at import (src/database/queries.py) —
+        # each rerun only binds parameters and executes
+        profile_db = db.execute(PROFILE_STMT, {"uid": user_id}).scalars().first()
 
         if not profile_db:
-            st.warning("Set your FTP in Settings and sync activities from the Strava Sync tab.")
-            st.stop()
+            return None
 
         ftp = profile_db.ftp
-        ctl = profile_db.ctl or 0
-        atl = profile_db.atl or 0
-        tsb = profile_db.tsb or 0
 
-        recent_7d_db = db.query(Activity).filter(
-            Activity.user_id == st.session_state.user["id"],
-            Activity.start_date >= datetime.now() - timedelta(days=7),
+        # Project only the needed columns — no full ORM hydration, rows are
+        # already-detached tuples (expire_on_commit=False), no copy pass needed
+        recent_7d = db.execute(
+            RECENT_7D_STMT,
+            {"uid": user_id, "since": datetime.now() - timedelta(days=7)},
         ).all()
-        recent_7d = [
-            {"start_date": a.start_date, "name": a.name, "duration": a.duration,
-             "tss": a.tss, "normalized_power": a.normalized_power}
-            for a in recent_7d_db
-        ]
 
-        recent_90d_db = db.query(Activity).filter(
-            Activity.user_id == st.session_state.user["id"],
-            Activity.start_date >= datetime.now() - timedelta(days=90),
-        ).order_by(Activity.start_date).all()
-        recent_90d = [
-            {"start_date": a.start_date, "tss": a.tss or 0,
-             "time_zone1": a.time_zone1, "time_zone2": a.time_zone2,
-             "time_zone3": a.time_zone3, "time_zone4": a.time_zone4,
-             "time_zone5": a.time_zone5, "time_zone6": a.time_zone6,
-             "time_zone7": a.time_zone7}
-            for a in recent_90d_db
-        ]
+        # Materialize the 90-day window straight into a DataFrame so the chart
+        # helpers work on columnar data with no list-of-dicts detour
+        since_90d = datetime.now() - timedelta(days=90)
+        recent_90d = pd.read_sql_query(
+            RECENT_90D_STMT,
+            con=db.connection(),
+            params={"uid": user_id, "since": since_90d},
+        )
+        recent_90d["tss"] = recent_90d["tss"].fillna(0)
+
+        # Weekly TSS + zone sums aggregated by SQLite in one pass
+        weekly_agg = pd.read_sql_query(
+            WEEKLY_AGG_STMT,
+            con=db.connection(),
+            params={"uid": user_id, "since": since_90d},
+        )
 
         power_profile_data = None
         if profile_db.best_5s:
@@ -172,13 +419,124 @@ with tab_overview:
                 "5min": profile_db.best_5min, "20min": profile_db.best_20min,
                 "60min": profile_db.best_60min,
             }.items() if v is not None}
+            from src.strava.power_profile import PowerProfileAnalyzer
+
             analyzer = PowerProfileAnalyzer(ftp=ftp, weight=profile_db.weight or 75.0)
             power_profile_data = analyzer.analyze_from_best_efforts(power_curve)
             power_profile_data["power_curve"] = power_curve
             power_profile_data["rider_type"] = profile_db.rider_type
 
+        return {
+            "ftp": ftp,
+            "ctl": profile_db.ctl or 0,
+            "atl": profile_db.atl or 0,
+            "tsb": profile_db.tsb or 0,
+            "recent_7d": recent_7d,
+            "recent_90d": recent_90d,
+            "weekly_agg": weekly_agg,
+            "power_profile_data": power_profile_data,
+        }
+
+
+@st.cache_data(ttl=300)
+def _build_overview_fig(recent_90d, weekly_agg):
+    # PMC + weekly TSS + zone pie as one subplot figure — one serialization
+    # and one frontend mount instead of three
+    from src.visualization.charts import create_overview_dashboard_chart
+    return create_overview_dashboard_chart(recent_90d, weekly_agg)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _recent_activities_table(user_id: int, latest_id):
+    """Formatted recent-activities table, keyed on the newest activity id so a
+    sync that inserts rows invalidates it naturally"""
+    import pandas as pd
+
+    with get_read_db() as db:
+        # Core column tuples via a precompiled statement — no ORM hydration
+        acts = db.execute(RECENT_ACTIVITIES_STMT, {"uid": user_id}).all()
+    if not acts:
+        return None
+    dfa = pd.DataFrame.from_records(
+        acts,
+        columns=["start_date", "name", "activity_type", "duration",
+                 "tss", "normalized_power"],
+    )
+    return pd.DataFrame({
+        "Date": pd.to_datetime(dfa["start_date"]).dt.strftime("%Y-%m-%d"),
+        "Name": dfa["name"], "Type": dfa["activity_type"],
+        "Duration": (dfa["duration"].fillna(0) // 60).astype(int).astype(str) + "min",
+        "TSS": dfa["tss"].astype(float).round(1),
+        "NP": dfa["normalized_power"].astype(float).round(0),
+    })
+
+
+@st.cache_data(ttl=300)
+def _build_spider_fig(power_curve, percentiles, rider_type):
+    from src.visualization.charts import create_power_curve_spider_chart
+    return create_power_curve_spider_chart(
+        power_curve=power_curve, percentiles=percentiles, rider_type=rider_type,
+    )
+
+
+# ── Background initial-sync status ────────────────────────────────────────────
+# Rendered before the tabs: the overview tab st.stop()s while the profile is
+# still empty, which is exactly the state the initial sync is filling in
+if "sync_future" in st.session_state:
+    # Self-rerunning fragment polls the future every 2s without rerunning the
+    # whole page; once done it clears the caches and triggers a full refresh
+    @st.fragment(run_every=2)
+    def _sync_status():
+        future = st.session_state.get("sync_future")
+        if future is None:
+            return
+        if not future.done():
+            st.info("⏳ Syncing your Strava history in the background — charts will appear shortly.")
+            return
+        del st.session_state["sync_future"]
+        try:
+            summary = future.result()
+        except Exception as e:
+            st.error(f"Background sync failed: {e}")
+            return
+        _load_overview_data.clear()
+        _recent_activities_table.clear()
+        if summary.get("profile"):
+            st.session_state.profile = summary["profile"]
+        st.success(f"✅ Initial sync finished — {summary['new']} activities imported.")
+        st.rerun(scope="app")
+
+    _sync_status()
+
+
+# ── Tabs ──────────────────────────────────────────────────────────────────────
+tab_overview, tab_sync = st.tabs(["📊 Overview", "🔄 Strava Sync"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TAB 1 — OVERVIEW
+# ═══════════════════════════════════════════════════════════════════════════════
+with tab_overview:
+    if "user" not in st.session_state:
+        st.info("Connect your Strava account in the **Strava Sync** tab to see your metrics.")
+        st.stop()
+
+    overview = _load_overview_data(st.session_state.user["id"])
+    if not overview:
+        st.warning("Set your FTP in Settings and sync activities from the Strava Sync tab.")
+        st.stop()
+
+    ftp = overview["ftp"]
+    ctl = overview["ctl"]
+    atl = overview["atl"]
+    tsb = overview["tsb"]
+    recent_7d = overview["recent_7d"]
+    recent_90d = overview["recent_90d"]
+    weekly_agg = overview["weekly_agg"]
+    power_profile_data = overview["power_profile_data"]
+
     # ── Fitness metrics row ───────────────────────────────────────────────────
-    tss_7d = sum(a["tss"] or 0 for a in recent_7d)
+    tss_7d = weekly_tss(st.session_state.user["id"])
     tsb_emoji = "🟢" if tsb > 5 else "🟡" if tsb > -10 else "🔴"
 
     c1, c2, c3, c4, c5 = st.columns(5)
@@ -199,14 +557,9 @@ with tab_overview:
 
     # ── Charts ────────────────────────────────────────────────────────────────
     if len(recent_90d) >= 5:
-        st.subheader("Performance Management Chart")
-        st.plotly_chart(create_pmc_chart(recent_90d), use_container_width=True)
-
-        c1, c2 = st.columns(2)
-        with c1:
-            st.plotly_chart(create_weekly_tss_chart(recent_90d), use_container_width=True)
-        with c2:
-            st.plotly_chart(create_zone_distribution_chart(recent_90d), use_container_width=True)
+        # Figure builder is cached — unrelated widget reruns reuse the built figure
+        st.subheader("Training Load")
+        st.plotly_chart(_build_overview_fig(recent_90d, weekly_agg), use_container_width=True)
 
         # Power profile
         if power_profile_data:
@@ -214,10 +567,10 @@ with tab_overview:
             st.subheader("Power Profile")
             c1, c2 = st.columns([2, 1])
             with c1:
-                spider_fig = create_power_curve_spider_chart(
-                    power_curve=power_profile_data["power_curve"],
-                    percentiles=power_profile_data["percentiles"],
-                    rider_type=power_profile_data["rider_type"],
+                spider_fig = _build_spider_fig(
+                    power_profile_data["power_curve"],
+                    power_profile_data["percentiles"],
+                    power_profile_data["rider_type"],
                 )
                 st.plotly_chart(spider_fig, use_container_width=True)
             with c2:
@@ -232,14 +585,21 @@ with tab_overview:
         st.markdown("---")
         st.subheader("Last 7 Days")
         if recent_7d:
-            rows = [
-                {"Date": a["start_date"].strftime("%a %d %b"), "Name": a["name"],
-                 "Duration": f"{(a['duration'] or 0) // 60}min",
-                 "TSS": round(a["tss"], 1) if a["tss"] else "N/A",
-                 "NP": round(a["normalized_power"], 0) if a["normalized_power"] else "N/A"}
-                for a in sorted(recent_7d, key=lambda x: x["start_date"], reverse=True)
-            ]
-            st.dataframe(rows, use_container_width=True)
+            import pandas as pd
+
+            # One DataFrame off the Core rows + column-wise formatting, instead
+            # of a per-row dict build (already sorted newest-first by the query)
+            df7 = pd.DataFrame.from_records(
+                recent_7d,
+                columns=["start_date", "name", "duration", "tss", "normalized_power"],
+            )
+            st.dataframe(pd.DataFrame({
+                "Date": pd.to_datetime(df7["start_date"]).dt.strftime("%a %d %b"),
+                "Name": df7["name"],
+                "Duration": (df7["duration"].fillna(0) // 60).astype(int).astype(str) + "min",
+                "TSS": df7["tss"].astype(float).round(1),
+                "NP": df7["normalized_power"].astype(float).round(0),
+            }), use_container_width=True)
         else:
             st.caption("No activities in the last 7 days.")
     else:
@@ -250,27 +610,28 @@ with tab_overview:
 # TAB 2 — STRAVA SYNC
 # ═══════════════════════════════════════════════════════════════════════════════
 with tab_sync:
-    auth = StravaAuth()
+    auth = _get_auth()
 
     if "user" not in st.session_state or not st.session_state.get("strava_connected"):
         st.subheader("Connect Strava")
         st.info("Connect your Strava account to sync training data.")
-        auth_url = auth.get_authorization_url()
+        # Native link button — no raw-HTML sanitizer pass or DOM diff per rerun;
+        # only the Strava-orange styling stays as a one-line <style> block
         st.markdown(
-            f'<div style="text-align:center;padding:20px">'
-            f'<a href="{auth_url}" target="_blank">'
-            f'<button style="background:#FC4C02;color:white;padding:12px 36px;font-size:16px;'
-            f'font-weight:bold;border:none;border-radius:5px;cursor:pointer">🔗 Connect with Strava</button>'
-            f'</a></div>',
+            "<style>.stLinkButton a {background:#FC4C02;color:white;font-weight:bold}</style>",
             unsafe_allow_html=True,
         )
+        st.link_button(
+            "🔗 Connect with Strava", auth.get_authorization_url(),
+            use_container_width=True,
+        )
         # Manual fallback
         manual_url = st.text_input(
             "Or paste the redirect URL here:",
             placeholder="http://localhost:8501/Dashboard?code=XXXXX&scope=...",
         )
         if manual_url and "code=" in manual_url:
-            m = re.search(r"code=([^&]+)", manual_url)
+            m = _CODE_RE.search(manual_url)
             if m:
                 with st.spinner("Connecting..."):
                     try:
@@ -279,6 +640,11 @@ with tab_sync:
                             user = _get_or_create_user(tokens, db)
                             st.session_state.user = {"id": user.id, "name": user.name}
                             st.session_state.strava_connected = True
+                        # Same background initial sync as the query-param path
+                        if "sync_future" not in st.session_state:
+                            st.session_state.sync_future = _get_executor().submit(
+                                _sync_training_data, user.id, tokens["access_token"], 90
+                            )
                         st.success("Connected!")
                         st.rerun()
                     except Exception as e:
@@ -294,115 +660,50 @@ with tab_sync:
                 st.rerun()
 
         st.subheader("Sync Training Data")
-        c1, c2 = st.columns(2)
+        c1, c2, c3 = st.columns(3)
         with c1:
             quick_sync = st.button("🔄 Quick Sync (7 days)", type="primary", use_container_width=True)
         with c2:
             full_sync = st.button("📥 Full Sync (3 months)", use_container_width=True)
+        with c3:
+            if st.button("🔁 Force refresh", use_container_width=True,
+                         help="Drop the cached Strava activity list before the next sync"):
+                _fetch_strava_activities.clear()
+                st.toast("Strava cache cleared — next sync fetches fresh data.")
 
         if quick_sync or full_sync:
             days = 7 if quick_sync else 90
             with st.spinner(f"Fetching Strava activities ({days} days)..."):
                 try:
-                    with get_db() as db:
-                        user = db.query(User).filter(User.id == st.session_state.user["id"]).first()
-                        profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
-                        if not profile:
-                            # Create a default profile so sync can proceed
-                            profile = UserProfile(user_id=user.id, ftp=200.0)
-                            db.add(profile)
-                            db.commit()
-                            st.info("No FTP set — using 200W as default. Update it in Settings for accurate zones.")
-                        token = _ensure_valid_token(user, db)
-                        client = StravaDataClient(token)
-                        after_date = datetime.now() - timedelta(days=days)
-                        activities = client.get_activities(after=after_date, limit=200 if days == 90 else 50)
-
-                    if not activities:
+                    uid = st.session_state.user["id"]
+                    token = _session_token()
+                    if token is None:
+                        # Session cache miss — fetch the user and refresh if needed
+                        with get_db() as db:
+                            user = db.query(User).filter(User.id == uid).first()
+                            token = _ensure_valid_token(user, db)
+
+                    progress_bar = st.progress(0)
+                    summary = _sync_training_data(
+                        uid, token, days, progress_callback=progress_bar.progress,
+                    )
+                    progress_bar.empty()
+
+                    if summary["default_ftp"]:
+                        st.info("No FTP set — using 200W as default. Update it in Settings for accurate zones.")
+                    if not summary["found"]:
                         st.warning("No activities found.")
                         st.stop()
 
-                    st.info(f"Found {len(activities)} activities — processing zones...")
-                    progress_bar = st.progress(0)
+                    st.session_state.profile = summary["profile"]
+                    metrics = summary["metrics"]
 
-                    with get_db() as db:
-                        user = db.query(User).filter(User.id == st.session_state.user["id"]).first()
-                        profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
-                        processor = StravaDataProcessor(ftp=profile.ftp)
-                        processed = processor.process_activities_batch(activities, fetch_streams=True, client=client)
-
-                        new_count = updated_count = 0
-                        for idx, act in enumerate(processed):
-                            progress_bar.progress((idx + 1) / len(processed))
-                            existing = db.query(Activity).filter(
-                                Activity.strava_activity_id == act["id"]
-                            ).first()
-                            fields = dict(
-                                name=act["name"], activity_type=act["type"],
-                                start_date=act["start_date"], duration=act["moving_time"],
-                                distance=act["distance"], average_watts=act.get("average_watts"),
-                                normalized_power=act.get("normalized_power"),
-                                tss=act.get("tss"), intensity_factor=act.get("intensity_factor"),
-                                time_zone1=act.get("time_zone1", 0), time_zone2=act.get("time_zone2", 0),
-                                time_zone3=act.get("time_zone3", 0), time_zone4=act.get("time_zone4", 0),
-                                time_zone5=act.get("time_zone5", 0), time_zone6=act.get("time_zone6", 0),
-                                time_zone7=act.get("time_zone7", 0),
-                            )
-                            if existing:
-                                for k, v in fields.items():
-                                    setattr(existing, k, v)
-                                updated_count += 1
-                            else:
-                                db.add(Activity(user_id=user.id, strava_activity_id=act["id"], **fields))
-                                new_count += 1
-
-                        db.commit()
-                        progress_bar.empty()
-
-                        # Recalc CTL/ATL/TSB
-                        all_acts = db.query(Activity).filter(Activity.user_id == user.id).all()
-                        metrics = TrainingMetrics.calculate_ctl_atl_tsb(
-                            [{"start_date": a.start_date, "tss": a.tss} for a in all_acts]
-                        )
-                        profile.ctl = metrics["ctl"]
-                        profile.atl = metrics["atl"]
-                        profile.tsb = metrics["tsb"]
-
-                        # Power curve
-                        three_months_ago = datetime.now() - timedelta(days=90)
-                        recent_acts_data = [
-                            {"max_watts": a.max_watts, "average_watts": a.average_watts,
-                             "duration": a.duration, "start_date": a.start_date}
-                            for a in all_acts
-                            if a.start_date >= three_months_ago and a.max_watts and a.max_watts > 0
-                        ]
-                        if recent_acts_data:
-                            best_efforts = calculate_best_efforts_from_activities(recent_acts_data)
-                            for attr, key in [("best_5s","5s"),("best_15s","15s"),("best_30s","30s"),
-                                              ("best_1min","1min"),("best_5min","5min"),
-                                              ("best_20min","20min"),("best_60min","60min")]:
-                                setattr(profile, attr, best_efforts.get(key))
-                            all_time = {k: getattr(profile, f"pr_{k.replace('s','s').replace('min','min')}", 0) or 0
-                                       for k in ["5s","15s","30s","1min","5min","20min","60min"]}
-                            updated_pr = update_power_curve_with_pr_tracking(best_efforts, all_time)
-                            for attr, key in [("pr_5s","5s"),("pr_15s","15s"),("pr_30s","30s"),
-                                              ("pr_1min","1min"),("pr_5min","5min"),
-                                              ("pr_20min","20min"),("pr_60min","60min")]:
-                                setattr(profile, attr, updated_pr.get(key))
-                            analyzer = PowerProfileAnalyzer(ftp=profile.ftp, weight=profile.weight or 75.0)
-                            analysis = analyzer.analyze_from_best_efforts(best_efforts)
-                            profile.rider_type = analysis["rider_type"]
-                            profile.power_profile_json = json.dumps(analysis)
-
-                        db.commit()
-
-                        st.session_state.profile = {
-                            "ftp": profile.ftp, "weight": profile.weight,
-                            "ctl": profile.ctl, "atl": profile.atl, "tsb": profile.tsb,
-                            "typical_workout_duration": 90,
-                        }
-
-                    st.success(f"Synced — {new_count} new, {updated_count} updated.")
+                    # Sync wrote new activities — drop the cached overview data
+                    # but keep the Strava activity-list memo for repeat syncs
+                    _load_overview_data.clear()
+                    _recent_activities_table.clear()  # updates may not change max(id)
+                    st.success(f"Synced — {summary['new']} new, {summary['updated']} updated, "
+                               f"{summary['skipped']} already up to date.")
                     c1, c2, c3 = st.columns(3)
                     c1.metric("CTL", f"{metrics['ctl']:.0f}")
                     c2.metric("ATL", f"{metrics['atl']:.0f}")
@@ -418,23 +719,15 @@ with tab_sync:
         if "user" in st.session_state:
             st.markdown("---")
             st.subheader("Recent Activities")
-            with get_db() as db:
-                acts = (
-                    db.query(Activity)
-                    .filter(Activity.user_id == st.session_state.user["id"])
-                    .order_by(Activity.start_date.desc())
-                    .limit(20)
-                    .all()
-                )
-                # Extract into plain dicts INSIDE the session to avoid DetachedInstanceError
-                rows = [
-                    {"Date": a.start_date.strftime("%Y-%m-%d"), "Name": a.name,
-                     "Type": a.activity_type, "Duration": f"{(a.duration or 0)//60}min",
-                     "TSS": round(a.tss, 1) if a.tss else "N/A",
-                     "NP": round(a.normalized_power, 0) if a.normalized_power else "N/A"}
-                    for a in acts
-                ]
-            if rows:
-                st.dataframe(rows, use_container_width=True)
+            from sqlalchemy import func
+
+            # Cheap index-only key lookup; the formatted table itself is memoized
+            with get_read_db() as db:
+                latest_id = db.query(func.max(Activity.id)).filter(
+                    Activity.user_id == st.session_state.user["id"]
+                ).scalar()
+            table = _recent_activities_table(st.session_state.user["id"], latest_id)
+            if table is not None:
+                st.dataframe(table, use_container_width=True)
             else:
                 st.info("No activities synced yet.")
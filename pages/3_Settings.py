@@ -2,10 +2,6 @@
 Settings page - User profile and preferences management
 """
 import streamlit as st
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.database.database import get_db
 from src.database.models import User, UserProfile, UserPreference
@@ -20,11 +16,31 @@ if "user" not in st.session_state:
 # Get user data
 user_id = st.session_state.user["id"]
 
-# Extract values from DB within session context
+
+@st.cache_data
+def _zone_lines(ftp: int) -> list:
+    """Formatted zone block, memoized per FTP — number_input reruns on every
+    keystroke and only the final value needs formatting again"""
+    return [
+        f"Z1 (Recovery): <{ftp * 0.55:.0f}W",
+        f"Z2 (Endurance): {ftp * 0.56:.0f}-{ftp * 0.75:.0f}W",
+        f"Z3 (Tempo): {ftp * 0.76:.0f}-{ftp * 0.90:.0f}W",
+        f"Z4 (Threshold): {ftp * 0.91:.0f}-{ftp * 1.05:.0f}W",
+        f"Z5 (VO2max): {ftp * 1.06:.0f}-{ftp * 1.20:.0f}W",
+    ]
+
+
+# Extract values from DB within session context — one joined SELECT instead
+# of three round-trips
 with get_db() as db:
-    user = db.query(User).filter(User.id == user_id).first()
-    profile_db = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
-    preferences_db = db.query(UserPreference).filter(UserPreference.user_id == user_id).first()
+    row = (
+        db.query(User, UserProfile, UserPreference)
+        .outerjoin(UserProfile, UserProfile.user_id == User.id)
+        .outerjoin(UserPreference, UserPreference.user_id == User.id)
+        .filter(User.id == user_id)
+        .first()
+    )
+    user, profile_db, preferences_db = row if row else (None, None, None)
 
     # Extract values to use outside session
     profile_ftp = profile_db.ftp if profile_db else 265
@@ -33,62 +49,72 @@ with get_db() as db:
     pref_recovery = preferences_db.recovery_preference if preferences_db and preferences_db.recovery_preference else "Moderate"
     pref_notes = preferences_db.notes if preferences_db and preferences_db.notes else ""
 
-# User Profile Section
-st.subheader("User Profile")
-
-col1, col2 = st.columns(2)
+# All inputs live in one form: edits don't rerun the page (or its SELECT)
+# per keystroke — only the submit does
+with st.form("settings_form"):
+    # User Profile Section
+    st.subheader("User Profile")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        ftp = st.number_input(
+            "FTP (Watts)", value=int(profile_ftp), min_value=100, max_value=500, step=1
+        )
+        weight = st.number_input(
+            "Weight (kg)",
+            value=float(profile_weight),
+            min_value=40.0,
+            max_value=150.0, step=0.5
+        )
+
+    with col2:
+        st.markdown("**Calculated Power Zones**")
+        if ftp:
+            st.text("\n".join(_zone_lines(int(ftp))))
+
+    # Training Preferences
+    st.subheader("Training Preferences")
+
+    typical_duration = st.slider(
+        "Typical workout duration (minutes)",
+        min_value=30,
+        max_value=180,
+        value=pref_duration,
+        step=15,
+    )
 
-with col1:
-    ftp = st.number_input(
-        "FTP (Watts)", value=int(profile_ftp), min_value=100, max_value=500, step=1
+    recovery_pref = st.select_slider(
+        "Recovery preference",
+        options=["Easy", "Moderate", "Hard"],
+        value=pref_recovery,
     )
-    weight = st.number_input(
-        "Weight (kg)",
-        value=float(profile_weight),
-        min_value=40.0,
-        max_value=150.0, step=0.5
+
+    # Agent Memory
+    st.subheader("Agent Memory")
+    notes = st.text_area(
+        "Training notes for the AI coach",
+        value=pref_notes,
+        placeholder="e.g., I prefer longer intervals, don't like short VO2max reps",
+        height=100,
     )
 
-with col2:
-    st.markdown("**Calculated Power Zones**")
-    if ftp:
-        st.text(f"Z1 (Recovery): <{ftp * 0.55:.0f}W")
-        st.text(f"Z2 (Endurance): {ftp * 0.56:.0f}-{ftp * 0.75:.0f}W")
-        st.text(f"Z3 (Tempo): {ftp * 0.76:.0f}-{ftp * 0.90:.0f}W")
-        st.text(f"Z4 (Threshold): {ftp * 0.91:.0f}-{ftp * 1.05:.0f}W")
-        st.text(f"Z5 (VO2max): {ftp * 1.06:.0f}-{ftp * 1.20:.0f}W")
-
-# Training Preferences
-st.subheader("Training Preferences")
-
-typical_duration = st.slider(
-    "Typical workout duration (minutes)",
-    min_value=30,
-    max_value=180,
-    value=pref_duration,
-    step=15,
-)
-
-recovery_pref = st.select_slider(
-    "Recovery preference",
-    options=["Easy", "Moderate", "Hard"],
-    value=pref_recovery,
-)
-
-# Agent Memory
-st.subheader("Agent Memory")
-notes = st.text_area(
-    "Training notes for the AI coach",
-    value=pref_notes,
-    placeholder="e.g., I prefer longer intervals, don't like short VO2max reps",
-    height=100,
-)
-
-# Save button
-if st.button("Save Settings", type="primary"):
+    submitted = st.form_submit_button("Save Settings", type="primary")
+
+if submitted:
     with get_db() as db:
+        # Fetch both rows in one query before branching on existence
+        existing = (
+            db.query(UserProfile, UserPreference)
+            .select_from(User)
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .outerjoin(UserPreference, UserPreference.user_id == User.id)
+            .filter(User.id == user_id)
+            .first()
+        )
+        existing_profile, existing_prefs = existing if existing else (None, None)
+
         # Update or create profile
-        existing_profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
         if not existing_profile:
             existing_profile = UserProfile(user_id=user_id)
             db.add(existing_profile)
@@ -107,7 +133,6 @@ if st.button("Save Settings", type="primary"):
         profile.zone6_max = ftp * 1.50
 
         # Update or create preferences
-        existing_prefs = db.query(UserPreference).filter(UserPreference.user_id == user_id).first()
         if not existing_prefs:
             existing_prefs = UserPreference(user_id=user_id)
             db.add(existing_prefs)
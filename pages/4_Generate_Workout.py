@@ -1,55 +1,194 @@
 """
 Generate Workout page - AI-powered workout generation with expert coaching
 """
+import re
 import streamlit as st
-import sys
-from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from sqlalchemy import case
 
-from src.agent.workout_agent import WorkoutAgent, safe_parse_number
 from src.database.database import get_db
 from src.database.models import Activity, WorkoutPlan, WorkoutFeedback
-from src.visualization.charts import create_workout_profile_chart
+from src.utils.agent_factory import get_workout_agent as _get_agent
 from src.utils.session_init import init_session
 from datetime import datetime, timedelta
 
+# The agent stack (LangChain/LangGraph) and Plotly are imported inside the
+# branches that need them — a rerun without a generate click pays neither.
+# The WorkoutAgent itself comes from the shared cached factory (_get_agent)
+
 init_session()
 
 st.title("Generate Workout")
 
 
+@st.cache_data(show_spinner=False, ttl=600)
+def _generate_workout_cached(user_id: int, final_request: str, target_type: str,
+                             profile: dict, history_key, feedback_key,
+                             _progress=None):
+    """Gather context, run the agent and persist the plan — memoized so an
+    identical request against unchanged data (keys are the newest activity and
+    feedback ids) returns the already-generated workout.
+
+    _progress (excluded from the cache key by the leading underscore) receives
+    a stage label as each agent node completes, for live UI updates."""
+    from src.agent.workout_agent import safe_parse_number
+
+    # One session for both context queries — a single pool checkout
+    with get_db() as db:
+        # Recent activities — project only the consumed columns into Row
+        # tuples instead of hydrating full Activity objects
+        rows = db.query(
+            Activity.start_date, Activity.name, Activity.duration, Activity.tss,
+        ).filter(
+            Activity.user_id == user_id,
+            Activity.start_date >= datetime.now() - timedelta(days=7)
+        ).order_by(Activity.start_date.desc()).limit(10).all()
+
+        history = [
+            {
+                "date": start_date.strftime("%Y-%m-%d"),
+                "name": name,
+                "duration": duration // 60,
+                "tss": tss,
+            }
+            for start_date, name, duration, tss in rows
+        ]
+
+        # Feedback history - TYPE-AWARE retrieval as ONE query: sort
+        # same-type feedback first via CASE instead of two round-trips
+        same_type = case(
+            (WorkoutFeedback.workout_type == (target_type or ""), 0),
+            else_=1,
+        ).label("same_type")
+        rows = db.query(
+            WorkoutPlan.name, WorkoutPlan.workout_type,
+            WorkoutFeedback.difficulty, WorkoutFeedback.rating,
+            WorkoutFeedback.notes, same_type,
+        ).join(
+            WorkoutPlan, WorkoutFeedback.workout_id == WorkoutPlan.id
+        ).filter(
+            WorkoutFeedback.user_id == user_id
+        ).order_by(same_type, WorkoutFeedback.created_at.desc()).limit(10).all()
+
+        feedback_history = [
+            {
+                "workout_name": name,
+                "workout_type": wtype or "Unknown",
+                "difficulty": difficulty,
+                "rating": rating,
+                "notes": notes,
+                "is_same_type": same == 0,
+            }
+            for name, wtype, difficulty, rating, notes, same in rows
+        ]
+
+    # Build profile with target type and generate — streamed per node when a
+    # progress sink is given, so the UI shows stages instead of a blank wait
+    profile_with_context = {**profile, "target_workout_type": target_type}
+    agent = _get_agent()
+    if _progress is None:
+        result = agent.generate_workout(
+            user_input=final_request,
+            user_profile=profile_with_context,
+            training_history=history,
+            feedback_history=feedback_history,
+        )
+    else:
+        result = None
+        for kind, payload in agent.generate_workout_stream(
+            user_input=final_request,
+            user_profile=profile_with_context,
+            training_history=history,
+            feedback_history=feedback_history,
+        ):
+            if kind == "progress":
+                _progress(payload)
+            else:
+                result = payload
+
+    # Save workout to database — one typed destructuring pass over the
+    # structure dict instead of re-reaching into result["structure"] per field
+    s = result["structure"]
+    name = s.get("NAME", "Workout")
+    workout_type = s.get("TYPE", "Unknown")
+    rationale = s.get("RATIONALE", "")
+    intervals = s.get("intervals", "")
+    duration_int = int(safe_parse_number(s.get("DURATION", 0), 0))
+    target_tss = safe_parse_number(s.get("TSS", 0), 0)
+    intensity_factor = safe_parse_number(s.get("IF", 0), 0)
+
+    with get_db() as db:
+        workout_plan = WorkoutPlan(
+            user_id=user_id,
+            name=name,
+            workout_type=workout_type,
+            description=rationale,
+            target_duration=duration_int,
+            target_tss=target_tss,
+            intensity_factor=intensity_factor,
+            interval_structure=intervals,
+            zwo_xml=result["workout_xml"],
+            user_request=final_request,
+            agent_reasoning=result["reasoning"]
+        )
+        db.add(workout_plan)
+        db.commit()
+        result["workout_id"] = workout_plan.id
+
+    return result
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _profile_fig(intervals_text: str, ftp: float):
+    """Parse intervals and build the power-profile figure once per workout —
+    feedback-widget reruns redraw from the memo"""
+    from src.visualization.charts import create_workout_profile_chart
+
+    intervals = _get_agent()._parse_intervals(intervals_text)
+    return create_workout_profile_chart(intervals, ftp)
+
+
+# Map UI labels to internal types — built once at import, not per call
+_TYPE_MAP = {
+    "Endurance": "Endurance",
+    "Tempo": "Tempo",
+    "Sweet Spot": "Sweet Spot",
+    "Threshold": "Threshold",
+    "VO2max": "VO2max",
+    "Anaerobic/Sprint": "Anaerobic",
+    "Force/SFR": "Force",
+    "Recovery": "Recovery",
+}
+
+# One compiled case-insensitive alternation per type (most-likely-first order)
+# — a single C-level regex scan replaces the per-keyword substring loop
+_TYPE_KEYWORDS = {
+    "Recovery": ["recovery", "easy", "recup", "recuperation"],
+    "Endurance": ["endurance", "z2", "zone 2", "base", "aerobic"],
+    "Tempo": ["tempo", "z3", "zone 3"],
+    "Sweet Spot": ["sweet spot", "sweetspot", "ss"],
+    "Threshold": ["threshold", "ftp", "seuil", "z4", "zone 4"],
+    "VO2max": ["vo2", "vo2max", "high intensity", "hiit"],
+    "Anaerobic": ["anaerobic", "sprint", "neuromuscular", "tabata", "micro-burst"],
+    "Force": ["force", "sfr", "strength", "low cadence", "torque"],
+}
+_TYPE_PATTERNS = {
+    wtype: re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, kws)), re.IGNORECASE)
+    for wtype, kws in _TYPE_KEYWORDS.items()
+}
+
+# Filename sanitization for the .zwo download — compiled once per process
+_SAFE = re.compile(r"\W+")
+
+
 def _infer_workout_type(workout_request: str, focus_area: str) -> str:
     """Infer the workout type from the user request and focus area selection."""
     if focus_area and focus_area != "Auto (let AI decide)":
-        # Map UI labels to internal types
-        type_map = {
-            "Endurance": "Endurance",
-            "Tempo": "Tempo",
-            "Sweet Spot": "Sweet Spot",
-            "Threshold": "Threshold",
-            "VO2max": "VO2max",
-            "Anaerobic/Sprint": "Anaerobic",
-            "Force/SFR": "Force",
-            "Recovery": "Recovery",
-        }
-        return type_map.get(focus_area, focus_area)
+        return _TYPE_MAP.get(focus_area, focus_area)
 
     # Keyword matching for presets and free-text
-    request_lower = workout_request.lower()
-    type_keywords = {
-        "Recovery": ["recovery", "easy", "recup", "recuperation"],
-        "Endurance": ["endurance", "z2", "zone 2", "base", "aerobic"],
-        "Tempo": ["tempo", "z3", "zone 3"],
-        "Sweet Spot": ["sweet spot", "sweetspot", "ss"],
-        "Threshold": ["threshold", "ftp", "seuil", "z4", "zone 4"],
-        "VO2max": ["vo2", "vo2max", "high intensity", "hiit"],
-        "Anaerobic": ["anaerobic", "sprint", "neuromuscular", "tabata", "micro-burst"],
-        "Force": ["force", "sfr", "strength", "low cadence", "torque"],
-    }
-    for wtype, keywords in type_keywords.items():
-        if any(kw in request_lower for kw in keywords):
+    for wtype, pattern in _TYPE_PATTERNS.items():
+        if pattern.search(workout_request):
             return wtype
     return ""  # Unknown
 
@@ -106,34 +245,41 @@ with col4:
 
 st.markdown("---")
 
-# Custom input
-workout_request = st.text_area(
-    "Or describe your ideal workout:",
-    value=st.session_state.get("workout_input", ""),
-    placeholder="Example: 90 min with over-under sweet spot intervals, or Billats 30/30 VO2max session...",
-    height=100
-)
+# Custom input + advanced options live in a form: typing in the text boxes or
+# dragging the slider no longer reruns the whole page per keystroke — the
+# script only re-executes on submit
+with st.form("generate_form"):
+    workout_request = st.text_area(
+        "Or describe your ideal workout:",
+        value=st.session_state.get("workout_input", ""),
+        placeholder="Example: 90 min with over-under sweet spot intervals, or Billats 30/30 VO2max session...",
+        height=100
+    )
 
-# Additional context
-with st.expander("Advanced Options"):
-    col1, col2 = st.columns(2)
+    # Additional context
+    with st.expander("Advanced Options"):
+        col1, col2 = st.columns(2)
 
-    with col1:
-        focus_area = st.selectbox(
-            "Focus Area",
-            ["Auto (let AI decide)", "Endurance", "Tempo", "Sweet Spot", "Threshold",
-             "VO2max", "Anaerobic/Sprint", "Force/SFR", "Recovery"]
-        )
+        with col1:
+            focus_area = st.selectbox(
+                "Focus Area",
+                ["Auto (let AI decide)", "Endurance", "Tempo", "Sweet Spot", "Threshold",
+                 "VO2max", "Anaerobic/Sprint", "Force/SFR", "Recovery"]
+            )
 
-    with col2:
-        duration_hint = st.slider(
-            "Target Duration (minutes)",
-            30, 180, 90, 15
+        with col2:
+            duration_hint = st.slider(
+                "Target Duration (minutes)",
+                30, 180, 90, 15
+            )
+
+        additional_notes = st.text_input(
+            "Additional notes (optional)",
+            placeholder="e.g., I prefer longer intervals, want to try over-unders, need low cadence work..."
         )
 
-    additional_notes = st.text_input(
-        "Additional notes (optional)",
-        placeholder="e.g., I prefer longer intervals, want to try over-unders, need low cadence work..."
+    generate_clicked = st.form_submit_button(
+        "Generate Workout", type="primary", use_container_width=True
     )
 
 # Display current fitness
@@ -157,10 +303,9 @@ elif tsb > -10:
 else:
     st.warning("Fatigued - consider recovery or easy endurance")
 
-# Generate button
 st.markdown("---")
 
-if st.button("Generate Workout", type="primary", use_container_width=True):
+if generate_clicked:
     if not workout_request.strip():
         st.error("Please describe what kind of workout you want!")
         st.stop()
@@ -179,103 +324,27 @@ if st.button("Generate Workout", type="primary", use_container_width=True):
             if additional_notes:
                 final_request += f" Notes: {additional_notes}"
 
-            # Get recent activities
-            with get_db() as db:
-                recent_activities = db.query(Activity).filter(
-                    Activity.user_id == st.session_state.user["id"],
-                    Activity.start_date >= datetime.now() - timedelta(days=7)
-                ).order_by(Activity.start_date.desc()).limit(10).all()
-
-                history = [
-                    {
-                        "date": act.start_date.strftime("%Y-%m-%d"),
-                        "name": act.name,
-                        "duration": act.duration // 60,
-                        "tss": act.tss
-                    }
-                    for act in recent_activities
-                ]
-
-            # Get feedback history - TYPE-AWARE retrieval
-            with get_db() as db:
-                if target_type:
-                    # Type-specific feedback (most relevant, up to 7)
-                    type_feedbacks = db.query(WorkoutFeedback, WorkoutPlan).join(
-                        WorkoutPlan, WorkoutFeedback.workout_id == WorkoutPlan.id
-                    ).filter(
-                        WorkoutFeedback.user_id == st.session_state.user["id"],
-                        WorkoutFeedback.workout_type == target_type
-                    ).order_by(WorkoutFeedback.created_at.desc()).limit(7).all()
-
-                    # General feedback from OTHER types (up to 3)
-                    general_feedbacks = db.query(WorkoutFeedback, WorkoutPlan).join(
-                        WorkoutPlan, WorkoutFeedback.workout_id == WorkoutPlan.id
-                    ).filter(
-                        WorkoutFeedback.user_id == st.session_state.user["id"],
-                        WorkoutFeedback.workout_type != target_type
-                    ).order_by(WorkoutFeedback.created_at.desc()).limit(3).all()
-                else:
-                    type_feedbacks = []
-                    general_feedbacks = db.query(WorkoutFeedback, WorkoutPlan).join(
-                        WorkoutPlan, WorkoutFeedback.workout_id == WorkoutPlan.id
-                    ).filter(
-                        WorkoutFeedback.user_id == st.session_state.user["id"]
-                    ).order_by(WorkoutFeedback.created_at.desc()).limit(10).all()
-
-                feedback_history = []
-                for fb, wp in type_feedbacks:
-                    feedback_history.append({
-                        "workout_name": wp.name,
-                        "workout_type": wp.workout_type or "Unknown",
-                        "difficulty": fb.difficulty,
-                        "rating": fb.rating,
-                        "notes": fb.notes,
-                        "is_same_type": True,
-                    })
-                for fb, wp in general_feedbacks:
-                    feedback_history.append({
-                        "workout_name": wp.name,
-                        "workout_type": wp.workout_type or "Unknown",
-                        "difficulty": fb.difficulty,
-                        "rating": fb.rating,
-                        "notes": fb.notes,
-                        "is_same_type": False,
-                    })
-
-            # Build profile with target type
-            profile_with_context = {**profile, "target_workout_type": target_type}
-
-            # Generate workout
-            agent = WorkoutAgent()
-            result = agent.generate_workout(
-                user_input=final_request,
-                user_profile=profile_with_context,
-                training_history=history,
-                feedback_history=feedback_history
-            )
-
-            # Save workout to database
-            duration_int = int(safe_parse_number(result["structure"].get("DURATION", 0), 0))
-            target_tss = safe_parse_number(result["structure"].get("TSS", 0), 0)
-            intensity_factor = safe_parse_number(result["structure"].get("IF", 0), 0)
+            # Cheap invalidation keys: a repeat click with the same request,
+            # profile and unchanged activity/feedback rows skips the detailed
+            # queries AND the LLM round-trip entirely
+            from sqlalchemy import func
 
             with get_db() as db:
-                workout_plan = WorkoutPlan(
-                    user_id=st.session_state.user["id"],
-                    name=result["structure"].get("NAME", "Workout"),
-                    workout_type=result["structure"].get("TYPE", "Unknown"),
-                    description=result["structure"].get("RATIONALE", ""),
-                    target_duration=duration_int,
-                    target_tss=target_tss,
-                    intensity_factor=intensity_factor,
-                    interval_structure=result["structure"].get("intervals", ""),
-                    zwo_xml=result["workout_xml"],
-                    user_request=final_request,
-                    agent_reasoning=result["reasoning"]
-                )
-                db.add(workout_plan)
-                db.commit()
-                result["workout_id"] = workout_plan.id
+                history_key = db.query(func.max(Activity.id)).filter(
+                    Activity.user_id == st.session_state.user["id"]
+                ).scalar()
+                feedback_key = db.query(func.max(WorkoutFeedback.id)).filter(
+                    WorkoutFeedback.user_id == st.session_state.user["id"]
+                ).scalar()
+
+            # Live stage updates while the agent runs (no-op on a cache hit)
+            progress_slot = st.empty()
+            result = _generate_workout_cached(
+                st.session_state.user["id"], final_request, target_type,
+                profile, history_key, feedback_key,
+                _progress=lambda label: progress_slot.info(label),
+            )
+            progress_slot.empty()
 
             # Store in session state
             st.session_state.generated_workout = result
@@ -318,14 +387,11 @@ if "generated_workout" in st.session_state:
 
     # Power Profile Chart
     st.markdown("**Power Profile**")
+    intervals_text = structure.get("intervals", "")
     try:
-        intervals_text = structure.get("intervals", "")
         if intervals_text:
-            agent = WorkoutAgent()
-            intervals = agent._parse_intervals(intervals_text)
             ftp = st.session_state.profile.get("ftp", 250)
-            profile_fig = create_workout_profile_chart(intervals, ftp)
-            st.plotly_chart(profile_fig, use_container_width=True)
+            st.plotly_chart(_profile_fig(intervals_text, ftp), use_container_width=True)
         else:
             st.warning("No interval data available for power profile")
     except Exception as e:
@@ -333,7 +399,7 @@ if "generated_workout" in st.session_state:
 
     # Intervals
     with st.expander("Workout Structure", expanded=False):
-        st.code(structure.get("intervals", structure.get("STRUCTURE", "No structure available")))
+        st.code(intervals_text or structure.get("STRUCTURE", "No structure available"))
 
     # Reasoning
     with st.expander("AI Reasoning (debug)", expanded=False):
@@ -350,7 +416,7 @@ if "generated_workout" in st.session_state:
         col1, col2 = st.columns([2, 1])
 
         with col1:
-            filename = f"{structure.get('NAME', 'workout').replace(' ', '_')}.zwo"
+            filename = _SAFE.sub("_", structure.get("NAME", "workout")) + ".zwo"
             st.download_button(
                 label="Download .zwo File",
                 data=zwo_xml,
@@ -374,24 +440,29 @@ if "generated_workout" in st.session_state:
         st.subheader("How was this workout?")
         st.info("Your feedback helps the AI learn your preferences!")
 
-        col1, col2 = st.columns(2)
+        # Same form treatment as the generation inputs — slider drags and
+        # note-typing don't rerun the page until the feedback is submitted
+        with st.form("feedback_form"):
+            col1, col2 = st.columns(2)
 
-        with col1:
-            difficulty = st.select_slider(
-                "Difficulty",
-                options=["too_easy", "perfect", "too_hard"],
-                value="perfect"
-            )
+            with col1:
+                difficulty = st.select_slider(
+                    "Difficulty",
+                    options=["too_easy", "perfect", "too_hard"],
+                    value="perfect"
+                )
 
-        with col2:
-            rating = st.slider("Rating", 1, 5, 3)
+            with col2:
+                rating = st.slider("Rating", 1, 5, 3)
 
-        notes = st.text_area(
-            "Notes (optional)",
-            placeholder="e.g., I prefer longer intervals, great workout, too many short efforts..."
-        )
+            notes = st.text_area(
+                "Notes (optional)",
+                placeholder="e.g., I prefer longer intervals, great workout, too many short efforts..."
+            )
+
+            feedback_clicked = st.form_submit_button("Submit Feedback", type="primary")
 
-        if st.button("Submit Feedback", type="primary"):
+        if feedback_clicked:
             with get_db() as db:
                 feedback = WorkoutFeedback(
                     workout_id=result.get("workout_id"),
@@ -399,7 +470,7 @@ if "generated_workout" in st.session_state:
                     rating=rating,
                     difficulty=difficulty,
                     notes=notes,
-                    workout_type=result.get("structure", {}).get("TYPE", None),
+                    workout_type=structure.get("TYPE", None),
                 )
                 db.add(feedback)
                 db.commit()
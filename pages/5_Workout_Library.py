@@ -1,20 +1,22 @@
 """
 Workout Library - Browse and manage generated workouts
 """
+import re
+
 import streamlit as st
-import sys
-from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from sqlalchemy import func, select
 
-from src.database.database import get_db
+from src.database.database import get_db, delete_workout_plans
 from src.database.models import WorkoutPlan, WorkoutFeedback
 from src.utils.session_init import init_session
 from datetime import datetime
 
 init_session()
 
+# Compiled once per process — filename sanitization for .zwo downloads
+_SAFE = re.compile(r"\W+")
+
 st.title("Workout Library")
 
 if "user" not in st.session_state:
@@ -38,60 +40,86 @@ with col2:
 with col3:
     sort_by = st.selectbox("Sort by", ["Date (newest)", "Date (oldest)", "TSS (high to low)", "Rating"])
 
-# Get workouts
+# Get workouts — Core column select, not ORM entities: the page only renders
+# plain values, so skip identity-map bookkeeping and per-attribute descriptor
+# hops, and get already-detached rows (no DetachedInstanceError to guard)
 with get_db() as db:
-    query = db.query(WorkoutPlan, WorkoutFeedback).outerjoin(
+    stmt = select(
+        WorkoutPlan.id, WorkoutPlan.name, WorkoutPlan.workout_type,
+        # Date formatting happens in SQLite's C strftime during projection,
+        # not as a Python call per row
+        func.strftime("%Y-%m-%d", WorkoutPlan.created_at).label("created_str"),
+        WorkoutPlan.target_tss, WorkoutPlan.target_duration,
+        WorkoutPlan.description, WorkoutPlan.interval_structure,
+        WorkoutPlan.user_request,
+        WorkoutFeedback.rating, WorkoutFeedback.difficulty, WorkoutFeedback.notes,
+    ).outerjoin(
         WorkoutFeedback, WorkoutPlan.id == WorkoutFeedback.workout_id
-    ).filter(WorkoutPlan.user_id == st.session_state.user["id"])
+    ).where(WorkoutPlan.user_id == st.session_state.user["id"])
 
     # Apply filters
     if filter_type != "All":
-        query = query.filter(WorkoutPlan.workout_type == filter_type)
+        stmt = stmt.where(WorkoutPlan.workout_type == filter_type)
 
     if filter_tss < 200:
-        query = query.filter(WorkoutPlan.target_tss <= filter_tss)
+        stmt = stmt.where(WorkoutPlan.target_tss <= filter_tss)
 
     # Apply sorting
     if sort_by == "Date (newest)":
-        query = query.order_by(WorkoutPlan.created_at.desc())
+        stmt = stmt.order_by(WorkoutPlan.created_at.desc())
     elif sort_by == "Date (oldest)":
-        query = query.order_by(WorkoutPlan.created_at.asc())
+        stmt = stmt.order_by(WorkoutPlan.created_at.asc())
     elif sort_by == "TSS (high to low)":
-        query = query.order_by(WorkoutPlan.target_tss.desc())
+        stmt = stmt.order_by(WorkoutPlan.target_tss.desc())
     elif sort_by == "Rating":
-        query = query.order_by(WorkoutFeedback.rating.desc())
+        stmt = stmt.order_by(WorkoutFeedback.rating.desc())
 
-    workouts_db = query.all()
+    # Count the filtered set separately so "Found N workouts" stays accurate
+    # while only one page of rows crosses the wire
+    total = db.scalar(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    )
+
+    if not total:
+        st.info("No workouts found. Generate your first workout on the Generate Workout page!")
+        st.stop()
+
+    # Server-side pagination — widget/DOM instantiation is O(page size)
+    # instead of O(library), and the LIMIT/OFFSET runs in SQL. The pager
+    # renders inside the same session block so count and page fetch share
+    # one pooled connection checkout per render
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        st.markdown(f"**Found {total} workouts**")
+    with col2:
+        per_page = st.selectbox("Per page", [10, 25, 50], index=1)
+    with col3:
+        n_pages = (total + per_page - 1) // per_page
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
 
-    # Extract data within session to avoid DetachedInstanceError
     workouts = []
-    for wp, fb in workouts_db:
+    for row in db.execute(stmt.limit(per_page).offset((page - 1) * per_page)):
         workout_data = {
-            "id": wp.id,
-            "name": wp.name,
-            "workout_type": wp.workout_type,
-            "created_at": wp.created_at,
-            "target_tss": wp.target_tss,
-            "target_duration": wp.target_duration,
-            "description": wp.description,
-            "interval_structure": wp.interval_structure,
-            "zwo_xml": wp.zwo_xml,
-            "user_request": wp.user_request
+            "id": row.id,
+            "name": row.name,
+            "workout_type": row.workout_type,
+            "created_str": row.created_str,
+            "target_tss": row.target_tss,
+            "target_duration": row.target_duration,
+            "description": row.description,
+            "interval_structure": row.interval_structure,
+            "user_request": row.user_request,
         }
+        # Outer join: feedback columns are NULL when no feedback row exists
         feedback_data = None
-        if fb:
+        if row.rating is not None or row.difficulty is not None or row.notes is not None:
             feedback_data = {
-                "rating": fb.rating,
-                "difficulty": fb.difficulty,
-                "notes": fb.notes
+                "rating": row.rating,
+                "difficulty": row.difficulty,
+                "notes": row.notes,
             }
         workouts.append((workout_data, feedback_data))
 
-if not workouts:
-    st.info("No workouts found. Generate your first workout on the Generate Workout page!")
-    st.stop()
-
-st.markdown(f"**Found {len(workouts)} workouts**")
 st.markdown("---")
 
 # Display workouts
@@ -101,7 +129,7 @@ for workout_data, feedback_data in workouts:
 
         with col1:
             st.markdown(f"### {workout_data['name']}")
-            st.caption(f"{workout_data['workout_type']} | {workout_data['created_at'].strftime('%Y-%m-%d')}")
+            st.caption(f"{workout_data['workout_type']} | {workout_data['created_str']}")
 
         with col2:
             st.metric("TSS", f"{workout_data['target_tss']:.0f}")
@@ -137,10 +165,16 @@ for workout_data, feedback_data in workouts:
 
         with col1:
             if st.button(f"Download .zwo", key=f"download_{workout_data['id']}"):
-                filename = f"{workout_data['name'].replace(' ', '_')}.zwo"
+                # zwo_xml is deferred out of the listing query (tens of KB per
+                # workout) and fetched only for the one being downloaded
+                with get_db() as db:
+                    zwo_xml = db.scalar(
+                        select(WorkoutPlan.zwo_xml).where(WorkoutPlan.id == workout_data['id'])
+                    )
+                filename = _SAFE.sub("_", workout_data['name']) + ".zwo"
                 st.download_button(
                     label="Click to download",
-                    data=workout_data['zwo_xml'],
+                    data=zwo_xml or "",
                     file_name=filename,
                     mime="application/xml",
                     key=f"dl_btn_{workout_data['id']}"
@@ -152,11 +186,27 @@ for workout_data, feedback_data in workouts:
                 st.switch_page("pages/4_Generate_Workout.py")
 
         with col3:
-            if st.button(f"Delete", key=f"delete_{workout_data['id']}", type="secondary"):
-                with get_db() as db:
-                    db.query(WorkoutPlan).filter(WorkoutPlan.id == workout_data['id']).delete()
-                    db.commit()
-                st.success("Workout deleted!")
-                st.rerun()
+            # Mark-for-delete checkbox — deletion happens in one batch below,
+            # one statement and one rerun instead of a full reload per workout
+            st.checkbox("Select for delete", key=f"select_{workout_data['id']}")
 
         st.markdown("---")
+
+# Batch delete — delete_workout_plans cleans up dependents (feedback rows,
+# program-slot references) in the same transaction, since foreign_keys=ON
+# rejects a bare DELETE on referenced plans
+selected_ids = [
+    wd["id"] for wd, _ in workouts if st.session_state.get(f"select_{wd['id']}")
+]
+if selected_ids:
+    if st.button(f"Delete selected ({len(selected_ids)})", type="secondary"):
+        try:
+            with get_db() as db:
+                delete_workout_plans(db, selected_ids)
+        except Exception as e:
+            st.error(f"Could not delete the selected workouts: {e}")
+        else:
+            for wid in selected_ids:
+                st.session_state.pop(f"select_{wid}", None)
+            st.success(f"Deleted {len(selected_ids)} workout(s)!")
+            st.rerun()
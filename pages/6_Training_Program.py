@@ -9,27 +9,28 @@ Training Program page — Multi-week periodized training plan with:
 """
 import json
 import traceback
-import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
 
 import streamlit as st
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from sqlalchemy import func, insert, select
 
 from src.database.database import get_db
 from src.database.models import (
     TrainingProgram, WeekPlan, PlannedWorkout, WorkoutPlan, WorkoutFeedback, Activity,
 )
-from src.agent.plan_agent import PlanAgent
-from src.agent.workout_bridge import generate_planned_workout, batch_generate_week_workouts
 from src.agent.adaptation import AdaptationEngine
+from src.utils.agent_factory import get_plan_agent, get_workout_agent
 from src.utils.session_init import init_session
 from src.visualization.charts import (
     create_program_timeline, create_planned_vs_actual_tss, create_program_progress_chart,
     create_workout_profile_chart,
 )
-from src.agent.workout_agent import WorkoutAgent
+# PlanAgent/WorkoutAgent construction goes through the cached factories above —
+# the LangGraph/LLM stack is built once per process, not per rerun; the
+# workout_bridge helpers are imported lazily at their call sites for the same
+# reason
 
 try:
     from src.trainingpeaks.client import TrainingPeaksClient
@@ -90,10 +91,29 @@ for key, default in [
 # HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+class _WeekView(NamedTuple):
+    """Attribute view over a week dict for AdaptationEngine, which expects
+    WeekPlan-like objects. Module-level so the class body isn't re-executed
+    on every rerun, and tuple slots beat a per-instance ``__dict__``."""
+    target_tss: float
+    actual_tss: Optional[float]
+    actual_ctl: Optional[float]
+
+
 def _load_common_data(program_id):
     """Return (program_data dict, weeks_data list) safely."""
+    from sqlalchemy.orm import raiseload, selectinload
+
     with get_db() as db:
-        prog = db.query(TrainingProgram).filter(TrainingProgram.id == program_id).first()
+        # selectinload pulls the program, all weeks and all workout slots in
+        # three queries total — the old per-week PlannedWorkout query was an
+        # N+1 over a 24-week program. raiseload guards against new lazy loads
+        # sneaking in; both relationships carry their ordering already
+        prog = db.query(TrainingProgram).options(
+            selectinload(TrainingProgram.week_plans)
+            .selectinload(WeekPlan.planned_workouts),
+            raiseload("*"),
+        ).filter(TrainingProgram.id == program_id).first()
         if not prog:
             return None, []
         program_data = {
@@ -106,12 +126,11 @@ def _load_common_data(program_id):
             "macro_plan_json": prog.macro_plan_json,
             "initial_ftp": prog.initial_ftp or 0,
             "initial_ctl": prog.initial_ctl or 0,
+            "updated_at": prog.updated_at,
         }
         weeks_data = []
         for w in prog.week_plans:
-            pws = db.query(PlannedWorkout).filter(
-                PlannedWorkout.week_plan_id == w.id
-            ).order_by(PlannedWorkout.day_index).all()
+            pws = w.planned_workouts  # eager-loaded, ordered by day_index
             weeks_data.append({
                 "id": w.id, "week_number": w.week_number,
                 "phase": w.phase, "target_tss": w.target_tss,
@@ -146,9 +165,8 @@ def _generate_workout_slots_for_week(week_plan_id, week_data, program_data):
         current_profile=st.session_state.profile,
     )
     with get_db() as db:
-        week_plan = db.query(WeekPlan).filter(WeekPlan.id == week_plan_id).first()
-        for slot in slots:
-            db.add(PlannedWorkout(
+        if slots:
+            db.execute(insert(PlannedWorkout), [dict(
                 week_plan_id=week_plan_id,
                 day_index=slot["day_index"],
                 workout_type=slot["workout_type"],
@@ -160,25 +178,54 @@ def _generate_workout_slots_for_week(week_plan_id, week_data, program_data):
                     f"Phase: {week_data['phase']}. {week_data.get('week_instructions','')}"
                 ),
                 status="planned",
-            ))
+            ) for slot in slots])
         db.commit()
 
 
+@st.cache_data(show_spinner=False)
+def _macro_plan(program_id: int, updated_at, raw_json: str) -> dict:
+    """Parsed macro plan, memoized per (program, last update) — reruns reuse
+    the parsed dict instead of re-walking a multi-KB JSON string"""
+    return json.loads(raw_json)
+
+
+# Figure construction is deterministic in its inputs — memoized so pure UI
+# interactions (expanders, buttons elsewhere on the page) skip the rebuild
+@st.cache_data(show_spinner=False)
+def _timeline_fig(macro_plan: dict):
+    return create_program_timeline(macro_plan)
+
+
+@st.cache_data(show_spinner=False)
+def _tss_fig(week_rows: list):
+    return create_planned_vs_actual_tss(week_rows)
+
+
+@st.cache_data(show_spinner=False)
+def _ctl_fig(macro_plan: dict, initial_ctl: float, week_rows: list):
+    return create_program_progress_chart(macro_plan, initial_ctl, week_rows)
+
+
 def _get_feedback_history():
+    # Column projection: tuples, no WorkoutFeedback hydration
     with get_db() as db:
-        fbs = db.query(WorkoutFeedback).filter(
+        fbs = db.query(
+            WorkoutFeedback.workout_type, WorkoutFeedback.difficulty,
+            WorkoutFeedback.rating, WorkoutFeedback.notes,
+        ).filter(
             WorkoutFeedback.user_id == user_id
         ).order_by(WorkoutFeedback.created_at.desc()).limit(20).all()
-        return [{"workout_type": f.workout_type, "difficulty": f.difficulty,
-                 "rating": f.rating, "notes": f.notes} for f in fbs]
+        return [{"workout_type": wt, "difficulty": diff,
+                 "rating": rating, "notes": notes} for wt, diff, rating, notes in fbs]
 
 
 def _get_training_history():
+    # Only the two consumed columns — no full Activity objects for 30 rows
     with get_db() as db:
-        acts = db.query(Activity).filter(
+        acts = db.query(Activity.start_date, Activity.tss).filter(
             Activity.user_id == user_id
         ).order_by(Activity.start_date.desc()).limit(30).all()
-        return [{"start_date": a.start_date.isoformat(), "tss": a.tss or 0} for a in acts]
+        return [{"start_date": d.isoformat(), "tss": tss or 0} for d, tss in acts]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -186,6 +233,9 @@ def _get_training_history():
 # ═══════════════════════════════════════════════════════════════════════════════
 def show_create_program_form():
     st.subheader("Create New Training Program")
+    # One clock read per render — every date below derives from the same
+    # instant, so all WeekPlan start/end dates align on an identical base
+    now = datetime.now()
 
     c1, c2 = st.columns(2)
     with c1:
@@ -196,8 +246,8 @@ def show_create_program_form():
         target_ftp = None
         if goal_type == "Increase FTP":
             target_ftp = st.number_input("Target FTP (W)", min_value=current_ftp, value=current_ftp + 30, step=5)
-        min_date = datetime.now().date() + timedelta(weeks=4)
-        max_date = datetime.now().date() + timedelta(weeks=24)
+        min_date = now.date() + timedelta(weeks=4)
+        max_date = now.date() + timedelta(weeks=24)
         target_date = st.date_input("Target Date", value=min_date + timedelta(weeks=8), min_value=min_date, max_value=max_date)
 
     with c2:
@@ -223,7 +273,7 @@ def show_create_program_form():
             st.error("Please describe your goal")
             return
 
-        total_weeks = (target_date - datetime.now().date()).days // 7
+        total_weeks = (target_date - now.date()).days // 7
 
         with st.spinner(f"AI Coach designing your {total_weeks}-week program…"):
             try:
@@ -235,14 +285,15 @@ def show_create_program_form():
                     f"Current FTP {current_ftp}W."
                 )
 
-                with get_db() as db:
-                    acts = db.query(Activity).filter(Activity.user_id == user_id).order_by(
-                        Activity.start_date.desc()).limit(30).all()
-                    history = [{"start_date": a.start_date.isoformat(), "tss": a.tss or 0} for a in acts]
-                    fbs = db.query(WorkoutFeedback).filter(WorkoutFeedback.user_id == user_id).all()
-                    feedback_history = [{"workout_type": f.workout_type, "difficulty": f.difficulty} for f in fbs]
+                # Shared column-projected helpers — no ORM hydration for context rows
+                history = _get_training_history()
+                fbs_feedback = _get_feedback_history()
+                feedback_history = [
+                    {"workout_type": f["workout_type"], "difficulty": f["difficulty"]}
+                    for f in fbs_feedback
+                ]
 
-                agent = PlanAgent()
+                agent = get_plan_agent()
                 result = agent.create_program(
                     user_input=user_input,
                     user_profile=st.session_state.profile,
@@ -261,7 +312,7 @@ def show_create_program_form():
                         goal_description=goal_description,
                         target_ftp=target_ftp,
                         target_date=datetime.combine(target_date, datetime.min.time()),
-                        start_date=datetime.now(),
+                        start_date=now,
                         hours_per_week=hours_per_week,
                         sessions_per_week=sessions_per_week,
                         macro_plan_json=json.dumps(macro_plan),
@@ -272,34 +323,46 @@ def show_create_program_form():
                     db.add(program)
                     db.flush()
 
-                    week_plan_ids = []
+                    # Single multi-row INSERT for all weeks instead of an
+                    # add+flush round-trip per week
+                    week_rows, week_meta = [], []
                     for i, wt in enumerate(week_targets):
                         wk = wt.get("week", i + 1)
                         phase = wt.get("phase", "Base")
-                        week_start = datetime.now() + timedelta(weeks=i)
-                        wp = WeekPlan(
+                        week_start = now + timedelta(weeks=i)
+                        target_tss = wt.get("target_tss", hours_per_week * 50)
+                        zone_focus = ", ".join(wt.get("zone_focus", ["Endurance"]))
+                        week_instructions = wt.get("week_instructions", "")
+                        week_rows.append(dict(
                             program_id=program.id,
                             week_number=wk,
                             phase=phase,
-                            target_tss=wt.get("target_tss", hours_per_week * 50),
+                            target_tss=target_tss,
                             target_hours=wt.get("target_hours", hours_per_week),
                             target_sessions=sessions_per_week,
-                            zone_focus=", ".join(wt.get("zone_focus", ["Endurance"])),
-                            week_instructions=wt.get("week_instructions", ""),
+                            zone_focus=zone_focus,
+                            week_instructions=week_instructions,
                             status="current" if i == 0 else "upcoming",
                             start_date=week_start,
                             end_date=week_start + timedelta(days=6),
-                        )
-                        db.add(wp)
-                        db.flush()
-                        week_plan_ids.append((wp.id, dict(
+                        ))
+                        week_meta.append((wk, dict(
                             week_number=wk, phase=phase,
-                            target_tss=wt.get("target_tss", hours_per_week * 50),
-                            zone_focus=", ".join(wt.get("zone_focus", ["Endurance"])),
-                            week_instructions=wt.get("week_instructions", ""),
+                            target_tss=target_tss,
+                            zone_focus=zone_focus,
+                            week_instructions=week_instructions,
                         )))
 
+                    if week_rows:
+                        db.execute(insert(WeekPlan), week_rows)
                     db.commit()
+
+                    # Map the generated ids back by week_number — one SELECT
+                    # instead of a flush per row just to read wp.id
+                    id_by_week = dict(db.query(WeekPlan.week_number, WeekPlan.id).filter(
+                        WeekPlan.program_id == program.id
+                    ).all())
+                    week_plan_ids = [(id_by_week[wk], wd) for wk, wd in week_meta]
                     program_id_new = program.id
 
                 # Generate workout slots for ALL weeks (deterministic, fast)
@@ -312,6 +375,7 @@ def show_create_program_form():
 
                 st.session_state.selected_program_id = program_id_new
                 st.session_state.program_view = "plan_review"
+                _load_active_programs.clear()
                 st.success("Program created! Review your plan below.")
                 st.rerun()
 
@@ -353,6 +417,7 @@ def show_plan_review(program_id: int):
                     {"status": "approved"}, synchronize_session=False
                 )
                 db.commit()
+            _load_week_bundle.clear()
             st.rerun()
     with c2:
         if st.button("⚡ Generate All .zwo", type="primary", use_container_width=True):
@@ -377,6 +442,8 @@ def show_plan_review(program_id: int):
                     ).all()
                     history = _get_training_history()
                     feedback = _get_feedback_history()
+                    from src.agent.workout_bridge import batch_generate_week_workouts
+
                     results = batch_generate_week_workouts(
                         planned_workouts=planned_objs,
                         user_profile=st.session_state.profile,
@@ -404,6 +471,7 @@ def show_plan_review(program_id: int):
                             pw_obj.workout_plan_id = wp.id
                             pw_obj.status = "generated"
                     db.commit()
+            _load_week_bundle.clear()
             st.success(f"Generated {len(all_planned)} workouts!")
             st.session_state.pop(f"batch_generate_{program_id}", None)
             st.rerun()
@@ -449,6 +517,7 @@ def show_plan_review(program_id: int):
                             WeekPlan.program_id == program_id, WeekPlan.week_number == wn
                         ).update({"status": "approved"}, synchronize_session=False)
                         db.commit()
+                    _load_week_bundle.clear()
                     st.rerun()
             with c2:
                 if st.button("✏️ Request Changes", key=f"change_{wn}"):
@@ -479,7 +548,7 @@ def show_plan_review(program_id: int):
                                         WeekPlan.week_number < wn
                                     ).order_by(WeekPlan.week_number.desc()).limit(3).all()
 
-                                    agent = PlanAgent()
+                                    agent = get_plan_agent()
                                     result = agent.plan_week(
                                         program=prog,
                                         week_number=wn,
@@ -498,12 +567,15 @@ def show_plan_review(program_id: int):
                                     ).delete(synchronize_session=False)
                                     db.commit()
 
-                                for workout_spec in result["week_detail"].get("planned_workouts", []):
+                                # One session, one multi-row INSERT — the old
+                                # loop opened a session and committed per spec
+                                specs = result["week_detail"].get("planned_workouts", [])
+                                if specs:
                                     with get_db() as db:
                                         week_plan = db.query(WeekPlan).filter(
                                             WeekPlan.program_id == program_id, WeekPlan.week_number == wn
                                         ).first()
-                                        db.add(PlannedWorkout(
+                                        db.execute(insert(PlannedWorkout), [dict(
                                             week_plan_id=week_plan.id,
                                             day_index=workout_spec["day_index"],
                                             workout_type=workout_spec["workout_type"],
@@ -511,9 +583,10 @@ def show_plan_review(program_id: int):
                                             target_duration=workout_spec["target_duration"],
                                             instructions=workout_spec.get("instructions", ""),
                                             status="planned",
-                                        ))
+                                        ) for workout_spec in specs])
                                         db.commit()
 
+                                _load_week_bundle.clear()
                                 st.success("Week updated!")
                                 st.session_state.pop(f"modify_week_{wn}", None)
                                 st.rerun()
@@ -525,10 +598,53 @@ def show_plan_review(program_id: int):
 # VIEW C — PROGRAM OVERVIEW (macro, charts, calendar)
 # ═══════════════════════════════════════════════════════════════════════════════
 def show_program_overview(program_id: int):
-    program_data, weeks_data = _load_common_data(program_id)
-    if not program_data:
-        st.error("Program not found")
-        return
+    # The overview never touches PlannedWorkout slots, so skip the full
+    # _load_common_data hydration: one joined fetch carrying the program
+    # columns plus the progress aggregates, then one trimmed week select for
+    # the charts — two statements total for the whole view
+    with get_db() as db:
+        prog = db.execute(
+            select(
+                TrainingProgram.id, TrainingProgram.name,
+                TrainingProgram.goal_description, TrainingProgram.target_ftp,
+                TrainingProgram.target_date, TrainingProgram.start_date,
+                TrainingProgram.initial_ftp, TrainingProgram.initial_ctl,
+                TrainingProgram.macro_plan_json, TrainingProgram.updated_at,
+                func.count().filter(WeekPlan.status == "completed").label("completed"),
+                func.count(WeekPlan.id).label("total"),
+                func.max(WeekPlan.actual_ctl).label("max_actual_ctl"),
+            ).outerjoin(WeekPlan, WeekPlan.program_id == TrainingProgram.id)
+            .where(TrainingProgram.id == program_id)
+            .group_by(TrainingProgram.id)
+        ).first()
+        if not prog:
+            st.error("Program not found")
+            return
+        program_data = {
+            "id": prog.id, "name": prog.name,
+            "goal_description": prog.goal_description,
+            "target_ftp": prog.target_ftp, "target_date": prog.target_date,
+            "start_date": prog.start_date,
+            "initial_ftp": prog.initial_ftp or 0,
+            "initial_ctl": prog.initial_ctl or 0,
+            "macro_plan_json": prog.macro_plan_json,
+            "updated_at": prog.updated_at,
+        }
+        completed, total, max_actual_ctl = prog.completed, prog.total, prog.max_actual_ctl
+        # Charts and the current-week banner only read these columns
+        week_rows = [
+            {"week_number": r.week_number, "target_tss": r.target_tss,
+             "actual_tss": r.actual_tss, "actual_ctl": r.actual_ctl,
+             "phase": r.phase, "status": r.status}
+            for r in db.execute(
+                select(
+                    WeekPlan.week_number, WeekPlan.target_tss,
+                    WeekPlan.actual_tss, WeekPlan.actual_ctl,
+                    WeekPlan.phase, WeekPlan.status,
+                ).where(WeekPlan.program_id == program_id)
+                .order_by(WeekPlan.week_number)
+            )
+        ]
 
     c1, c2, c3 = st.columns([3, 1, 1])
     with c1:
@@ -546,8 +662,6 @@ def show_program_overview(program_id: int):
     st.markdown("---")
 
     # Progress metrics
-    completed = len([w for w in weeks_data if w["status"] == "completed"])
-    total = len(weeks_data)
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("Weeks", f"{completed}/{total}")
     current_ftp = st.session_state.profile.get("ftp", 0)
@@ -558,40 +672,41 @@ def show_program_overview(program_id: int):
         c2.metric("FTP", f"{current_ftp}W")
     days_left = (program_data["target_date"] - datetime.now()).days
     c3.metric("Days Left", days_left)
-    c4.metric("CTL", f"{st.session_state.profile.get('ctl', 0):.0f}",
-              delta=f"+{st.session_state.profile.get('ctl', 0) - program_data['initial_ctl']:.0f}")
+    # Latest synced week CTL as fallback when the session profile has none
+    current_ctl = st.session_state.profile.get("ctl", 0) or (max_actual_ctl or 0)
+    c4.metric("CTL", f"{current_ctl:.0f}",
+              delta=f"+{current_ctl - program_data['initial_ctl']:.0f}")
     st.progress(completed / total if total else 0)
 
     # Phase timeline
     st.markdown("---")
-    macro_plan = json.loads(program_data["macro_plan_json"])
+    macro_plan = _macro_plan(
+        program_data["id"], program_data.get("updated_at"), program_data["macro_plan_json"]
+    )
+    # The three figures are independent, so build them in parallel on a cold
+    # cache; on warm reruns the submits resolve straight from st.cache_data.
+    # The cached helpers are safe off the main thread: plain-dict inputs, no
+    # widgets, spinners disabled
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_timeline = ex.submit(_timeline_fig, macro_plan)
+        f_tss = ex.submit(_tss_fig, week_rows)
+        f_ctl = ex.submit(_ctl_fig, macro_plan, program_data["initial_ctl"], week_rows)
     try:
-        st.plotly_chart(create_program_timeline(macro_plan), use_container_width=True)
+        st.plotly_chart(f_timeline.result(), use_container_width=True)
     except Exception:
         pass
 
-    # TSS planned vs actual + CTL progression
+    # TSS planned vs actual + CTL progression — the chart helpers take plain
+    # week dicts, so the inputs are hashable and the built figures are memoized
     c1, c2 = st.columns(2)
-    class _Week:
-        def __init__(self, d):
-            self.week_number = d["week_number"]
-            self.target_tss = d["target_tss"]
-            self.actual_tss = d["actual_tss"]
-            self.actual_ctl = d.get("actual_ctl")
-            self.phase = d["phase"]
-    mock_weeks = [_Week(w) for w in weeks_data]
-    class _Prog:
-        def __init__(self, d):
-            self.initial_ctl = d["initial_ctl"]
-            self.macro_plan_json = d["macro_plan_json"]
     with c1:
         try:
-            st.plotly_chart(create_planned_vs_actual_tss(mock_weeks), use_container_width=True)
+            st.plotly_chart(f_tss.result(), use_container_width=True)
         except Exception:
             pass
     with c2:
         try:
-            st.plotly_chart(create_program_progress_chart(_Prog(program_data), mock_weeks), use_container_width=True)
+            st.plotly_chart(f_ctl.result(), use_container_width=True)
         except Exception:
             pass
 
@@ -617,19 +732,22 @@ def show_program_overview(program_id: int):
             else:
                 st.caption("Add TRAININGPEAKS_CLIENT_ID to .env to enable TP sync")
 
-    # Re-evaluation UI
-    if st.session_state.get(f"reevaluate_{program_id}"):
-        _show_reevaluation(program_id, program_data, weeks_data)
-
-    # TrainingPeaks sync UI
-    if st.session_state.get(f"tp_sync_{program_id}") and _TP_AVAILABLE:
-        _show_tp_sync(program_id, program_data, weeks_data)
+    # Re-evaluation / TrainingPeaks sync UIs — these are the only consumers of
+    # the full week rows (incl. workout slots), so hydrate them on demand
+    if st.session_state.get(f"reevaluate_{program_id}") or (
+        st.session_state.get(f"tp_sync_{program_id}") and _TP_AVAILABLE
+    ):
+        _, weeks_data = _load_common_data(program_id)
+        if st.session_state.get(f"reevaluate_{program_id}"):
+            _show_reevaluation(program_id, program_data, weeks_data)
+        if st.session_state.get(f"tp_sync_{program_id}") and _TP_AVAILABLE:
+            _show_tp_sync(program_id, program_data, weeks_data)
 
     # Current week
     st.markdown("---")
     st.subheader("Current Week")
-    current_week = next((w for w in weeks_data if w["status"] == "current"),
-                        weeks_data[0] if weeks_data else None)
+    current_week = next((w for w in week_rows if w["status"] == "current"),
+                        week_rows[0] if week_rows else None)
     if current_week:
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Week", current_week["week_number"])
@@ -649,12 +767,11 @@ def _show_reevaluation(program_id, program_data, weeks_data):
 
     # Find completed + current weeks
     recent_completed = [w for w in weeks_data if w["status"] == "completed"][-3:]
-
-    class _WeekMock:
-        def __init__(self, d):
-            for k, v in d.items():
-                setattr(self, k, v)
-    recent_mocks = [_WeekMock(w) for w in recent_completed]
+    recent_mocks = [
+        _WeekView(target_tss=w["target_tss"], actual_tss=w["actual_tss"],
+                  actual_ctl=w["actual_ctl"])
+        for w in recent_completed
+    ]
 
     adjustments = engine.calculate_adjustments(
         program=None,
@@ -689,6 +806,7 @@ def _show_reevaluation(program_id, program_data, weeks_data):
                     wk.target_tss = round(wk.target_tss * multiplier, 1)
                     wk.adaptation_notes = "; ".join(adjustments["reasons"])
                 db.commit()
+            _load_week_bundle.clear()
             st.success(f"Updated {len(upcoming)} upcoming weeks.")
             st.session_state.pop(f"reevaluate_{program_id}", None)
             st.rerun()
@@ -727,16 +845,24 @@ def _show_tp_sync(program_id, program_data, weeks_data):
 
         if st.button("Upload all planned workouts to TrainingPeaks"):
             all_pw = [pw for w in weeks_data for pw in w["planned_workouts"]]
-            # Enrich with zwo if generated
+            # Enrich with zwo if generated — one IN-list query for every
+            # generated plan instead of a session + SELECT per workout
+            plan_ids = [pw["workout_plan_id"] for pw in all_pw if pw["workout_plan_id"]]
+            plans_by_id = {}
+            if plan_ids:
+                with get_db() as db:
+                    plans_by_id = {
+                        row.id: (row.name, row.zwo_xml)
+                        for row in db.execute(
+                            select(WorkoutPlan.id, WorkoutPlan.name, WorkoutPlan.zwo_xml)
+                            .where(WorkoutPlan.id.in_(plan_ids))
+                        )
+                    }
             enriched = []
             for pw in all_pw:
                 entry = dict(pw)
-                if pw["workout_plan_id"]:
-                    with get_db() as db:
-                        wp = db.query(WorkoutPlan).filter(WorkoutPlan.id == pw["workout_plan_id"]).first()
-                        if wp:
-                            entry["name"] = wp.name
-                            entry["zwo_xml"] = wp.zwo_xml
+                if pw["workout_plan_id"] in plans_by_id:
+                    entry["name"], entry["zwo_xml"] = plans_by_id[pw["workout_plan_id"]]
                 enriched.append(entry)
 
             with st.spinner("Uploading to TrainingPeaks…"):
@@ -822,18 +948,19 @@ def show_calendar(program_id: int):
 # ═══════════════════════════════════════════════════════════════════════════════
 # VIEW E — WEEK DETAIL
 # ═══════════════════════════════════════════════════════════════════════════════
-def show_week_detail(program_id: int, week_number: int):
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_week_bundle(program_id: int, week_number: int):
+    """Materialize the week-detail reads as plain dicts, memoized per
+    (program, week). Toggle/navigation reruns hit the cache instead of
+    reissuing the same SELECTs; every write path below calls
+    ``_load_week_bundle.clear()`` after commit, with the TTL as backstop."""
     with get_db() as db:
         program = db.query(TrainingProgram).filter(TrainingProgram.id == program_id).first()
         week_plan = db.query(WeekPlan).filter(
             WeekPlan.program_id == program_id, WeekPlan.week_number == week_number
         ).first()
-        if not week_plan:
-            # Week number out of range — reset to overview
-            st.session_state.selected_week_number = 1
-            st.session_state.program_view = "overview"
-            st.rerun()
-            return
+        if not program or not week_plan:
+            return None, None, [], 0
 
         program_data = {
             "id": program.id, "name": program.name,
@@ -857,6 +984,22 @@ def show_week_detail(program_id: int, week_number: int):
             "instructions": pw.instructions or "",
             "status": pw.status, "workout_plan_id": pw.workout_plan_id,
         } for pw in planned_workouts]
+        max_week_number = db.query(func.max(WeekPlan.week_number)).filter(
+            WeekPlan.program_id == program_id
+        ).scalar() or week_number
+    return program_data, week_data, workouts_data, max_week_number
+
+
+def show_week_detail(program_id: int, week_number: int):
+    program_data, week_data, workouts_data, max_week_number = _load_week_bundle(
+        program_id, week_number
+    )
+    if not week_data:
+        # Week number out of range — reset to overview
+        st.session_state.selected_week_number = 1
+        st.session_state.program_view = "overview"
+        st.rerun()
+        return
 
     # Header
     c1, c2, c3 = st.columns([3, 1, 1])
@@ -884,13 +1027,7 @@ def show_week_detail(program_id: int, week_number: int):
     if week_data["adaptation_notes"]:
         st.warning(f"Adaptations: {week_data['adaptation_notes']}")
 
-    # Nav between weeks — check bounds using loaded data
-    with get_db() as db:
-        max_week = db.query(WeekPlan).filter(
-            WeekPlan.program_id == program_id
-        ).order_by(WeekPlan.week_number.desc()).first()
-        max_week_number = max_week.week_number if max_week else week_number
-
+    # Nav between weeks — bounds come from the cached bundle
     c1, c2, c3 = st.columns([1, 3, 1])
     with c1:
         if week_number > 1 and st.button("← Prev Week"):
@@ -913,7 +1050,7 @@ def show_week_detail(program_id: int, week_number: int):
                             WeekPlan.program_id == program_id,
                             WeekPlan.week_number < week_number
                         ).order_by(WeekPlan.week_number.desc()).limit(3).all()
-                        agent = PlanAgent()
+                        agent = get_plan_agent()
                         result = agent.plan_week(
                             program=prog, week_number=week_number,
                             user_profile=st.session_state.profile, recent_weeks=recent,
@@ -921,17 +1058,20 @@ def show_week_detail(program_id: int, week_number: int):
                         wk = db.query(WeekPlan).filter(
                             WeekPlan.program_id == program_id, WeekPlan.week_number == week_number
                         ).first()
-                        for spec in result["week_detail"].get("planned_workouts", []):
-                            db.add(PlannedWorkout(
-                                week_plan_id=wk.id,
-                                day_index=spec["day_index"],
-                                workout_type=spec["workout_type"],
-                                target_tss=spec["target_tss"],
-                                target_duration=spec["target_duration"],
-                                instructions=spec.get("instructions", ""),
-                                status="planned",
-                            ))
+                        # One multi-row INSERT for the whole week's slots
+                        rows = [dict(
+                            week_plan_id=wk.id,
+                            day_index=spec["day_index"],
+                            workout_type=spec["workout_type"],
+                            target_tss=spec["target_tss"],
+                            target_duration=spec["target_duration"],
+                            instructions=spec.get("instructions", ""),
+                            status="planned",
+                        ) for spec in result["week_detail"].get("planned_workouts", [])]
+                        if rows:
+                            db.execute(insert(PlannedWorkout), rows)
                         db.commit()
+                    _load_week_bundle.clear()
                     st.success("Workouts planned!")
                     st.rerun()
                 except Exception as e:
@@ -958,6 +1098,7 @@ def show_week_detail(program_id: int, week_number: int):
                     {"status": "skipped"}, synchronize_session=False
                 )
                 db.commit()
+            _load_week_bundle.clear()
             st.rerun()
     with c2:
         if st.button("🔄 Re-plan This Week (adaptive)", use_container_width=True):
@@ -994,18 +1135,20 @@ def show_week_detail(program_id: int, week_number: int):
                         zone_focus=zone_focus,
                         current_profile=st.session_state.profile,
                     )
-                    for slot in slots:
-                        db.add(PlannedWorkout(
-                            week_plan_id=wk.id,
-                            day_index=slot["day_index"],
-                            workout_type=slot["workout_type"],
-                            target_tss=slot["target_tss"],
-                            target_duration=slot["target_duration"],
-                            instructions=f"{slot['workout_type']} · {slot['target_duration']}min · TSS {slot['target_tss']:.0f}",
-                            status="planned",
-                        ))
+                    rows = [dict(
+                        week_plan_id=wk.id,
+                        day_index=slot["day_index"],
+                        workout_type=slot["workout_type"],
+                        target_tss=slot["target_tss"],
+                        target_duration=slot["target_duration"],
+                        instructions=f"{slot['workout_type']} · {slot['target_duration']}min · TSS {slot['target_tss']:.0f}",
+                        status="planned",
+                    ) for slot in slots]
+                    if rows:
+                        db.execute(insert(PlannedWorkout), rows)
                     db.commit()
 
+                _load_week_bundle.clear()
                 for r in adjustments["reasons"]:
                     st.info(r)
                 st.success(f"Re-planned! New TSS target: {new_tss:.0f}")
@@ -1076,6 +1219,8 @@ def _do_generate_workout(wid, workout, week_data, is_alternative=False):
                     pw_obj.instructions = (pw_obj.instructions or "") + " [ALTERNATIVE: propose a different interval structure with same energy system but different format]"
                 history = _get_training_history()
                 feedback = _get_feedback_history()
+                from src.agent.workout_bridge import generate_planned_workout
+
                 result = generate_planned_workout(
                     planned_workout=pw_obj,
                     user_profile=st.session_state.profile,
@@ -1102,6 +1247,7 @@ def _do_generate_workout(wid, workout, week_data, is_alternative=False):
                     pw_obj.workout_plan_id = wp.id
                     pw_obj.status = "generated"
                     db.commit()
+                    _load_week_bundle.clear()
                     st.success(f"{'Alternative' if is_alternative else 'Workout'} generated!")
                     st.session_state.pop(f"generating_{wid}", None)
                     st.session_state.pop(f"gen_alt_{wid}", None)
@@ -1121,19 +1267,42 @@ def _do_generate_alternative(wid, workout, week_data):
     _do_generate_workout(wid, workout, week_data, is_alternative=True)
 
 
-def _render_workout_details(wid, workout):
+@st.cache_data(show_spinner=False, max_entries=256)
+def _load_workout_plan_details(workout_plan_id: int):
+    """Generated WorkoutPlans are immutable (regeneration creates a new row),
+    so the details payload is memoized per id — the panel staying open across
+    reruns costs no further session checkouts."""
     with get_db() as db:
-        wp = db.query(WorkoutPlan).filter(WorkoutPlan.id == workout["workout_plan_id"]).first()
+        wp = db.query(WorkoutPlan).filter(WorkoutPlan.id == workout_plan_id).first()
         if not wp:
-            return
-        name = wp.name
-        wtype = wp.workout_type
-        tss = wp.target_tss
-        if_ = wp.intensity_factor
-        desc = wp.description
-        interval_structure = wp.interval_structure
-        zwo_xml = wp.zwo_xml
-        reasoning = wp.agent_reasoning
+            return None
+        return {
+            "name": wp.name, "workout_type": wp.workout_type,
+            "target_tss": wp.target_tss, "intensity_factor": wp.intensity_factor,
+            "description": wp.description,
+            "interval_structure": wp.interval_structure,
+            "zwo_xml": wp.zwo_xml, "agent_reasoning": wp.agent_reasoning,
+        }
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _details_profile_fig(interval_structure: str, ftp: float):
+    intervals = get_workout_agent()._parse_intervals(interval_structure)
+    return create_workout_profile_chart(intervals, ftp)
+
+
+def _render_workout_details(wid, workout):
+    details = _load_workout_plan_details(workout["workout_plan_id"])
+    if not details:
+        return
+    name = details["name"]
+    wtype = details["workout_type"]
+    tss = details["target_tss"]
+    if_ = details["intensity_factor"]
+    desc = details["description"]
+    interval_structure = details["interval_structure"]
+    zwo_xml = details["zwo_xml"]
+    reasoning = details["agent_reasoning"]
 
     st.markdown("---")
     st.markdown(f"### {name}")
@@ -1148,10 +1317,8 @@ def _render_workout_details(wid, workout):
     # Interval chart
     if zwo_xml:
         try:
-            from src.agent.workout_agent import WorkoutAgent as _WA
-            intervals = _WA()._parse_intervals(interval_structure)
             ftp = st.session_state.profile.get("ftp", 250)
-            st.plotly_chart(create_workout_profile_chart(intervals, ftp), use_container_width=True)
+            st.plotly_chart(_details_profile_fig(interval_structure, ftp), use_container_width=True)
         except Exception:
             pass
 
@@ -1179,14 +1346,26 @@ def _render_workout_details(wid, workout):
 # ═══════════════════════════════════════════════════════════════════════════════
 # MAIN ROUTER
 # ═══════════════════════════════════════════════════════════════════════════════
-with get_db() as db:
-    programs_list = [{
-        "id": p.id, "name": p.name,
-        "target_date": p.target_date, "status": p.status,
-    } for p in db.query(TrainingProgram).filter(
-        TrainingProgram.user_id == user_id,
-        TrainingProgram.status.in_(["active", "paused"])
-    ).all()]
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_active_programs(uid: int) -> list:
+    """Active-program list for the router — runs on every rerun, changes only
+    when a program is created, so memoize with a short TTL.
+    Columnar select: the list view only renders these four values.
+    target_date stays a datetime — its "%B" month-name display format has no
+    SQLite strftime equivalent, so formatting remains Python-side."""
+    with get_db() as db:
+        return [{
+            "id": p.id, "name": p.name,
+            "target_date": p.target_date, "status": p.status,
+        } for p in db.execute(
+            select(TrainingProgram.id, TrainingProgram.name,
+                   TrainingProgram.target_date, TrainingProgram.status)
+            .where(TrainingProgram.user_id == uid,
+                   TrainingProgram.status.in_(["active", "paused"]))
+        )]
+
+
+programs_list = _load_active_programs(user_id)
 
 view = st.session_state.program_view
 
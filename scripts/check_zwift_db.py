@@ -3,61 +3,88 @@ Check Zwift workouts database statistics
 """
 import sys
 from pathlib import Path
-from collections import Counter
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import case, func, select
+
 from src.database.database import get_db
 from src.database.models import ZwiftWorkout
 
 
 def main():
+    # All stats come back as SQL aggregates — no full-table ORM
+    # materialization, one grouped/binned query per section
     with get_db() as db:
-        workouts = db.query(ZwiftWorkout).all()
+        total = db.query(func.count(ZwiftWorkout.id)).scalar() or 0
 
         print("=" * 60)
         print("ZWIFT WORKOUTS DATABASE STATS")
         print("=" * 60)
-        print(f"\nTotal workouts: {len(workouts)}")
+        print(f"\nTotal workouts: {total}")
 
         # Group by category
-        categories = Counter(w.category for w in workouts if w.category)
+        categories = db.execute(
+            select(ZwiftWorkout.category, func.count())
+            .where(ZwiftWorkout.category.isnot(None))
+            .group_by(ZwiftWorkout.category)
+            .order_by(func.count().desc())
+        ).all()
         print(f"\nWorkouts by category ({len(categories)} categories):")
-        for cat, count in categories.most_common(15):
+        for cat, count in categories[:15]:
             print(f"  {cat}: {count}")
 
         # Group by workout type
-        types = Counter(w.workout_type for w in workouts if w.workout_type)
+        types = db.execute(
+            select(ZwiftWorkout.workout_type, func.count())
+            .where(ZwiftWorkout.workout_type.isnot(None))
+            .group_by(ZwiftWorkout.workout_type)
+            .order_by(func.count().desc())
+        ).all()
         print(f"\nWorkouts by type:")
-        for wtype, count in types.most_common():
+        for wtype, count in types:
             print(f"  {wtype}: {count}")
 
-        # Duration distribution
+        # Duration distribution — CASE-binned counts in one scan
+        d = ZwiftWorkout.duration_minutes
+        short, medium, long, very_long = db.execute(
+            select(
+                func.count(case(((d > 0) & (d < 30), 1))),
+                func.count(case(((d >= 30) & (d < 60), 1))),
+                func.count(case(((d >= 60) & (d < 90), 1))),
+                func.count(case((d >= 90, 1))),
+            )
+        ).one()
         print(f"\nDuration distribution:")
-        short = len([w for w in workouts if w.duration_minutes and w.duration_minutes < 30])
-        medium = len([w for w in workouts if w.duration_minutes and 30 <= w.duration_minutes < 60])
-        long = len([w for w in workouts if w.duration_minutes and 60 <= w.duration_minutes < 90])
-        very_long = len([w for w in workouts if w.duration_minutes and w.duration_minutes >= 90])
         print(f"  < 30min: {short}")
         print(f"  30-60min: {medium}")
         print(f"  60-90min: {long}")
         print(f"  >= 90min: {very_long}")
 
-        # TSS distribution
+        # TSS distribution — same single-scan binning
+        t = ZwiftWorkout.tss
+        easy, moderate, hard, very_hard = db.execute(
+            select(
+                func.count(case(((t > 0) & (t < 40), 1))),
+                func.count(case(((t >= 40) & (t < 70), 1))),
+                func.count(case(((t >= 70) & (t < 100), 1))),
+                func.count(case((t >= 100, 1))),
+            )
+        ).one()
         print(f"\nTSS distribution:")
-        easy = len([w for w in workouts if w.tss and w.tss < 40])
-        moderate = len([w for w in workouts if w.tss and 40 <= w.tss < 70])
-        hard = len([w for w in workouts if w.tss and 70 <= w.tss < 100])
-        very_hard = len([w for w in workouts if w.tss and w.tss >= 100])
         print(f"  < 40 TSS (Easy): {easy}")
         print(f"  40-70 TSS (Moderate): {moderate}")
         print(f"  70-100 TSS (Hard): {hard}")
         print(f"  >= 100 TSS (Very Hard): {very_hard}")
 
-        # Sample workouts from each type
+        # Sample workouts from each type — three columns, LIMIT 1 per type
         print(f"\nSample workouts:")
         for wtype in ["Recovery", "Endurance", "Sweet Spot", "Threshold", "VO2max", "Anaerobic"]:
-            sample = db.query(ZwiftWorkout).filter(ZwiftWorkout.workout_type == wtype).first()
+            sample = db.execute(
+                select(ZwiftWorkout.name, ZwiftWorkout.duration_minutes, ZwiftWorkout.tss)
+                .where(ZwiftWorkout.workout_type == wtype)
+                .limit(1)
+            ).first()
             if sample:
                 print(f"  {wtype}: {sample.name} ({sample.duration_minutes}min, TSS {sample.tss})")
 
@@ -3,11 +3,14 @@ Generate RAG documents from ZwiftWorkout database
 Creates formatted text documents for embedding into vector DB
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import json
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import func
+
 from src.database.database import get_db
 from src.database.models import ZwiftWorkout
 
@@ -102,6 +105,12 @@ def format_workout_as_rag_doc(workout):
     }
 
 
+def _write_doc(filepath, text):
+    """Write one document — runs on the write pool."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
 def main():
     """Generate RAG documents from all Zwift workouts in DB"""
     print("=" * 60)
@@ -112,44 +121,61 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     with get_db() as db:
-        workouts = db.query(ZwiftWorkout).all()
+        # Cheap count for progress reporting, then stream rows in batches —
+        # no full-table materialization before the first file is written
+        total = db.query(func.count(ZwiftWorkout.id)).scalar() or 0
 
-        print(f"\nFound {len(workouts)} workouts in database")
+        print(f"\nFound {total} workouts in database")
         print(f"Generating RAG documents...\n")
 
         generated = 0
         skipped = 0
 
-        for workout in workouts:
-            try:
-                # Generate document
-                doc = format_workout_as_rag_doc(workout)
-
-                # Clean filename
-                filename = f"{workout.id:05d}_{workout.name[:50]}.txt"
-                filename = filename.replace('/', '_').replace('\\', '_').replace(':', '_')
-
-                filepath = output_dir / filename
-
-                # Write text file
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(doc['text'])
-
-                generated += 1
-
-                if generated % 100 == 0:
-                    print(f"  Generated {generated}/{len(workouts)}...")
-
-            except Exception as e:
-                print(f"  Error generating doc for {workout.name}: {e}")
-                skipped += 1
-                continue
+        workouts = db.query(ZwiftWorkout).execution_options(
+            stream_results=True
+        ).yield_per(200)
+
+        # Formatting stays on the main thread (row fetch + pure Python), the
+        # IO-bound file writes go to a pool so the kernel overlaps them with
+        # the next batch fetch
+        futures = []
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            for workout in workouts:
+                try:
+                    # Generate document
+                    doc = format_workout_as_rag_doc(workout)
+
+                    # Clean filename
+                    filename = f"{workout.id:05d}_{workout.name[:50]}.txt"
+                    filename = filename.replace('/', '_').replace('\\', '_').replace(':', '_')
+
+                    futures.append(pool.submit(
+                        _write_doc, output_dir / filename, doc['text']
+                    ))
+
+                except Exception as e:
+                    print(f"  Error generating doc for {workout.name}: {e}")
+                    skipped += 1
+                    continue
+                finally:
+                    # Release the ORM row as soon as its write is queued
+                    db.expunge(workout)
+
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    generated += 1
+                    if generated % 100 == 0:
+                        print(f"  Generated {generated}/{total}...")
+                except Exception as e:
+                    print(f"  Error writing doc: {e}")
+                    skipped += 1
 
         # Save metadata index
         metadata_file = output_dir / "metadata_index.json"
         with open(metadata_file, 'w', encoding='utf-8') as f:
             json.dump({
-                'total_workouts': len(workouts),
+                'total_workouts': total,
                 'generated_docs': generated,
                 'skipped': skipped,
                 'output_dir': str(output_dir),
@@ -8,7 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.database.database import get_db, engine
-from src.database.models import WorkoutFeedback, WorkoutPlan
+from src.database.models import WorkoutFeedback
 from sqlalchemy import text
 
 # Add column if it doesn't exist (SQLite doesn't support IF NOT EXISTS for columns)
@@ -23,14 +23,24 @@ except Exception as e:
     else:
         print(f"Column may already exist: {e}")
 
-# Backfill existing rows
+# Backfill existing rows — one correlated UPDATE instead of a SELECT per
+# feedback row followed by per-row UPDATEs on commit
 with get_db() as db:
-    feedbacks = db.query(WorkoutFeedback).filter(WorkoutFeedback.workout_type == None).all()
-    updated = 0
-    for fb in feedbacks:
-        workout = db.query(WorkoutPlan).filter(WorkoutPlan.id == fb.workout_id).first()
-        if workout and workout.workout_type:
-            fb.workout_type = workout.workout_type
-            updated += 1
+    missing = db.query(WorkoutFeedback).filter(
+        WorkoutFeedback.workout_type == None
+    ).count()
+    result = db.execute(text(
+        "UPDATE workout_feedback "
+        "SET workout_type = ("
+        "  SELECT wp.workout_type FROM workout_plans wp"
+        "  WHERE wp.id = workout_feedback.workout_id"
+        ") "
+        "WHERE workout_feedback.workout_type IS NULL "
+        "AND EXISTS ("
+        "  SELECT 1 FROM workout_plans wp"
+        "  WHERE wp.id = workout_feedback.workout_id"
+        "  AND wp.workout_type IS NOT NULL"
+        ")"
+    ))
     db.commit()
-    print(f"Backfilled {updated}/{len(feedbacks)} feedback rows with workout_type")
+    print(f"Backfilled {result.rowcount}/{missing} feedback rows with workout_type")
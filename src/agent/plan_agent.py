@@ -1,6 +1,7 @@
 """
 LangGraph Agent for Training Program Planning - Expert Periodization Coach
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypedDict, Annotated, Sequence, Dict, List
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
@@ -255,21 +256,27 @@ READINESS: {'Fresh and ready (TSB>0)' if profile.get('tsb', 0) > 0 else 'Fatigue
             queries_for_cat = self.PERIODIZATION_QUERIES.get(cat, [])
             all_queries.extend(queries_for_cat)
 
-        # Execute queries and deduplicate
+        # Execute queries concurrently and deduplicate — each query is an
+        # independent vector-store round-trip, so the fan-out costs roughly one
+        # RTT instead of a serial walk over ~15 queries. executor.map keeps
+        # result order, so deduplication stays deterministic
+        def _run_query(query):
+            try:
+                return self.kb.query(query, limit=3, score_threshold=0.4)
+            except Exception as e:
+                print(f"RAG query failed: {e}")
+                return []
+
         all_results = []
         seen_texts = set()
 
-        for query in all_queries:
-            try:
-                results = self.kb.query(query, limit=3, score_threshold=0.4)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for results in executor.map(_run_query, all_queries):
                 for r in results:
                     text_key = r["text"][:100]
                     if text_key not in seen_texts:
                         seen_texts.add(text_key)
                         all_results.append(r)
-            except Exception as e:
-                print(f"RAG query failed: {e}")
-                continue
 
         # Sort by score and take top 10 results, 1000 chars each (~10k chars total context)
         all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
@@ -1084,3 +1084,59 @@ COOLDOWN: 600, 0.52, 0.45, 85
             "reasoning": final_state["reasoning"],
             "structure": final_state["workout_structure"],
         }
+
+    # Progress labels per graph node, in execution order
+    NODE_LABELS = {
+        "analyze_rider": "Analyzing your rider profile…",
+        "retrieve_memory": "Recalling your past feedback…",
+        "retrieve_theory": "Consulting the training theory library…",
+        "plan_workout": "Designing the workout…",
+        "generate_structure": "Building the interval structure…",
+        "format_zwo": "Writing the .zwo file…",
+    }
+
+    def generate_workout_stream(
+        self,
+        user_input: str,
+        user_profile: dict,
+        training_history: list,
+        feedback_history: list = None
+    ):
+        """
+        Generate a workout, yielding progress as each graph node completes
+
+        The structured-output calls can't stream partial JSON meaningfully, so
+        progress is surfaced per node rather than per token — enough for the
+        UI to show what the coach is doing instead of a silent spinner.
+
+        Yields:
+            ("progress", label) after each node, then ("result", dict) with
+            the same payload as generate_workout()
+        """
+        target_type = user_profile.get("target_workout_type", "")
+
+        initial_state = AgentState(
+            messages=[],
+            user_input=user_input,
+            user_profile=user_profile,
+            training_history=training_history,
+            user_feedback_history=feedback_history or [],
+            rag_context="",
+            memory_context="",
+            workout_structure={},
+            workout_xml="",
+            reasoning="",
+            target_workout_type=target_type,
+        )
+
+        state = dict(initial_state)
+        for update in self.graph.stream(initial_state):
+            for node_name, delta in update.items():
+                state.update(delta)
+                yield "progress", self.NODE_LABELS.get(node_name, node_name)
+
+        yield "result", {
+            "workout_xml": state["workout_xml"],
+            "reasoning": state["reasoning"],
+            "structure": state["workout_structure"],
+        }
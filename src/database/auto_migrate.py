@@ -4,15 +4,18 @@ Auto-migration system - runs on app startup
 from sqlalchemy import text, inspect
 from .database import engine, get_db
 from .models import WorkoutFeedback
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def auto_migrate():
     """
     Auto-migrate database schema on startup.
     Safe to run multiple times - checks if columns exist before adding.
+    Cached so the introspection queries run once per process, not per session.
     """
     migrations = []
 
@@ -34,6 +37,7 @@ def auto_migrate():
         ("user_profiles", "pr_60min", "FLOAT"),
         ("user_profiles", "rider_type", "VARCHAR"),
         ("user_profiles", "power_profile_json", "TEXT"),
+        ("users", "just_connected", "BOOLEAN"),
     ]
 
     with engine.connect() as conn:
@@ -52,6 +56,16 @@ def auto_migrate():
                     except Exception as e:
                         logger.error(f"Failed to add {table_name}.{col_name}: {e}")
 
+    # Composite index for dashboard range scans (CREATE INDEX IF NOT EXISTS is idempotent)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_act_user_date ON activities(user_id, start_date DESC)"
+            ))
+            conn.commit()
+    except Exception as e:
+        logger.error(f"Failed to create ix_act_user_date index: {e}")
+
     # One-time cleanup: clear old feedback (only if workout_type column exists but data is pre-refactor)
     try:
         with get_db() as db:
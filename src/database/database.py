@@ -1,21 +1,93 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, delete, event, func, select, update
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 from config import settings
-from .models import Base
+from .models import Base, Activity, PlannedWorkout, WorkoutFeedback, WorkoutPlan
 
 
-# Create engine
+# Create engine — persistent QueuePool so every Streamlit rerun reuses
+# already-open connections instead of paying a fresh SQLite open per query
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+    query_cache_size=1200,
+    connect_args={"timeout": 5, "check_same_thread": False} if "sqlite" in settings.database_url else {}
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune SQLite on every new connection.
+
+    WAL lets Streamlit reads coexist with the OAuth server's writes
+    without lock thrash; synchronous=NORMAL cuts fsync cost per commit.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _set_sqlite_read_pragmas(dbapi_connection, connection_record):
+    """Pragmas for read-only connections (no journal-mode change — that needs write access)"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+if "sqlite" in settings.database_url:
+    event.listens_for(engine, "connect")(_set_sqlite_pragmas)
+
+    # Two-pool split: dashboard SELECTs go through a read-only pool that never
+    # contends for the WAL writer lock; OAuth/sync writes go through a size-1
+    # pool so writes serialize instead of racking up SQLITE_BUSY.
+    _db_path = settings.database_url.replace("sqlite:///", "", 1)
+    read_engine = create_engine(
+        f"sqlite:///file:{_db_path}?mode=ro&cache=private&uri=true",
+        poolclass=QueuePool,
+        pool_size=os.cpu_count() or 4,
+        max_overflow=10,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+        query_cache_size=1200,
+        connect_args={"timeout": 5, "check_same_thread": False},
+    )
+    event.listens_for(read_engine, "connect")(_set_sqlite_read_pragmas)
+
+    write_engine = create_engine(
+        settings.database_url,
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_recycle=3600,
+        pool_pre_ping=True,
+        connect_args={"timeout": 5, "check_same_thread": False, "isolation_level": "IMMEDIATE"},
+    )
+    event.listens_for(write_engine, "connect")(_set_sqlite_pragmas)
+else:
+    read_engine = engine
+    write_engine = engine
+
+# Session factories
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
+WriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=write_engine)
 
 
 def init_db():
@@ -45,6 +117,80 @@ def get_db() -> Session:
         db.close()
 
 
+@contextmanager
+def get_read_db() -> Session:
+    """
+    Context manager for read-only database sessions (dashboard queries)
+
+    Usage:
+        with get_read_db() as db:
+            activities = db.query(Activity).all()
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def get_write_db() -> Session:
+    """
+    Context manager for write sessions (OAuth callback, sync) — serialized pool
+
+    Usage:
+        with get_write_db() as db:
+            db.add(user)
+    """
+    db = WriteSessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def weekly_tss(user_id: int, days: int = 7) -> float:
+    """
+    Sum TSS over the last `days` days in SQL — returns one scalar instead of
+    materializing activity rows just to add them in Python
+    """
+    with get_read_db() as db:
+        return db.scalar(
+            select(func.coalesce(func.sum(Activity.tss), 0)).where(
+                Activity.user_id == user_id,
+                Activity.start_date >= datetime.now() - timedelta(days=days),
+            )
+        )
+
+
+def delete_workout_plans(db: Session, plan_ids: list) -> None:
+    """
+    Delete WorkoutPlan rows together with their dependents, in order.
+
+    foreign_keys=ON means SQLite enforces the references from
+    WorkoutFeedback.workout_id and PlannedWorkout.workout_plan_id, and the
+    schema has no cascades — a bare DELETE on workout_plans raises
+    IntegrityError as soon as a plan has feedback or belongs to a program.
+    Feedback goes with its workout; program slots are detached and reset to
+    "planned" so the week view offers regeneration. Any WorkoutPlan delete
+    path must come through here.
+    """
+    if not plan_ids:
+        return
+    db.execute(delete(WorkoutFeedback).where(WorkoutFeedback.workout_id.in_(plan_ids)))
+    db.execute(
+        update(PlannedWorkout)
+        .where(PlannedWorkout.workout_plan_id.in_(plan_ids))
+        .values(workout_plan_id=None, status="planned")
+    )
+    db.execute(delete(WorkoutPlan).where(WorkoutPlan.id.in_(plan_ids)))
+    db.commit()
+
+
 def get_db_session() -> Session:
     """
     Get database session (for dependency injection)
@@ -1,7 +1,7 @@
 """
 SQLAlchemy models for Trainer Agent
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -25,6 +25,9 @@ class User(Base):
     strava_refresh_token = Column(String, nullable=True)
     strava_token_expires_at = Column(DateTime, nullable=True)
 
+    # Set by oauth_server.py after a fresh OAuth connect; cleared once Streamlit picks it up
+    just_connected = Column(Boolean, default=False)
+
     # Relationships
     profile = relationship("UserProfile", back_populates="user", uselist=False)
     activities = relationship("Activity", back_populates="user")
@@ -106,6 +109,8 @@ class Activity(Base):
     """Cycling activity from Strava with calculated metrics"""
 
     __tablename__ = "activities"
+    # Composite index for the dashboard's `user_id = ? AND start_date >= ?` range scans
+    __table_args__ = (Index("ix_act_user_date", "user_id", "start_date"),)
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -0,0 +1,63 @@
+"""
+Precompiled query statements for hot read paths
+
+Built once at import so every Streamlit rerun pays only parameter bind +
+execute, not statement construction; SQLAlchemy's compiled cache and SQLite's
+prepared statements do the rest.
+"""
+from sqlalchemy import bindparam, select, text
+from .models import Activity, UserProfile
+
+
+# Dashboard: user profile lookup
+PROFILE_STMT = select(UserProfile).where(UserProfile.user_id == bindparam("uid"))
+
+# Dashboard: last-7-days activity table
+RECENT_7D_STMT = (
+    select(
+        Activity.start_date, Activity.name, Activity.duration,
+        Activity.tss, Activity.normalized_power,
+    )
+    .where(
+        Activity.user_id == bindparam("uid"),
+        Activity.start_date >= bindparam("since"),
+    )
+    .order_by(Activity.start_date.desc())
+)
+
+# Dashboard sync tab: "Recent Activities" table (Core column tuples, no ORM)
+RECENT_ACTIVITIES_STMT = (
+    select(
+        Activity.start_date, Activity.name, Activity.activity_type,
+        Activity.duration, Activity.tss, Activity.normalized_power,
+    )
+    .where(Activity.user_id == bindparam("uid"))
+    .order_by(Activity.start_date.desc())
+    .limit(20)
+)
+
+# Dashboard: weekly TSS + zone sums aggregated in SQL — one pass in SQLite,
+# O(weeks) rows shipped to Python instead of O(activities)
+WEEKLY_AGG_STMT = text("""
+    SELECT date(start_date, 'weekday 0', '-6 days') AS week,
+           SUM(COALESCE(tss, 0)) AS tss,
+           SUM(time_zone1) AS time_zone1, SUM(time_zone2) AS time_zone2,
+           SUM(time_zone3) AS time_zone3, SUM(time_zone4) AS time_zone4,
+           SUM(time_zone5) AS time_zone5, SUM(time_zone6) AS time_zone6,
+           SUM(time_zone7) AS time_zone7
+    FROM activities
+    WHERE user_id = :uid AND start_date >= :since
+    GROUP BY week
+    ORDER BY week
+""")
+
+# Dashboard: 90-day window for the PMC chart (weekly/zone charts use the
+# SQL aggregate above)
+RECENT_90D_STMT = (
+    select(Activity.start_date, Activity.tss)
+    .where(
+        Activity.user_id == bindparam("uid"),
+        Activity.start_date >= bindparam("since"),
+    )
+    .order_by(Activity.start_date)
+)
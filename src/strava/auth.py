@@ -1,11 +1,42 @@
 """
 Strava OAuth authentication
 """
+import threading
+import time
 from stravalib.client import Client
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import settings
 from datetime import datetime, timedelta
 
 
+# Coalescing cache for token refreshes: keyed by refresh token, shared across
+# all StravaAuth instances in the process so overlapping callers (Streamlit
+# rerun + background sync) share one Strava round-trip instead of racing
+_REFRESH_CACHE_TTL = 30  # seconds
+_refresh_cache = {}  # refresh_token -> (timestamp, token dict)
+_refresh_lock = threading.Lock()
+
+
+def mount_http_adapter(client: Client):
+    """Mount a pooled, retrying HTTPAdapter on a stravalib client's session
+
+    Shared by StravaAuth and StravaDataClient so every stravalib client in the
+    process keeps its TLS connections to strava.com alive and retries
+    transient failures the same way.
+    """
+    session = getattr(getattr(client, "protocol", None), "rsession", None)
+    if session is None:
+        return
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.2,
+                          status_forcelist=(429, 500, 502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+
+
 class StravaAuth:
     """Handle Strava OAuth flow"""
 
@@ -13,6 +44,11 @@ class StravaAuth:
         self.client_id = settings.strava_client_id
         self.client_secret = settings.strava_client_secret
         self.redirect_uri = settings.strava_redirect_uri
+        # One shared stravalib client per StravaAuth — reusing its underlying
+        # requests.Session keeps the TLS connection to strava.com alive across
+        # the token exchange, athlete fetch and refresh calls
+        self._client = Client()
+        mount_http_adapter(self._client)
 
     def get_authorization_url(self) -> str:
         """
@@ -21,7 +57,7 @@ class StravaAuth:
         Returns:
             Authorization URL for user to visit
         """
-        client = Client()
+        client = self._client
         url = client.authorization_url(
             client_id=self.client_id,
             redirect_uri=self.redirect_uri,
@@ -39,7 +75,7 @@ class StravaAuth:
         Returns:
             Dict with access_token, refresh_token, expires_at, strava_id, athlete_name
         """
-        client = Client()
+        client = self._client
         token_response = client.exchange_code_for_token(
             client_id=self.client_id, client_secret=self.client_secret, code=code
         )
@@ -84,15 +120,20 @@ class StravaAuth:
         Returns:
             Dict with new access_token, refresh_token, expires_at
         """
-        client = Client()
-        token_response = client.refresh_access_token(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            refresh_token=refresh_token,
-        )
+        with _refresh_lock:
+            cached = _refresh_cache.get(refresh_token)
+            if cached and time.monotonic() - cached[0] < _REFRESH_CACHE_TTL:
+                return cached[1]
 
-        return {
-            "access_token": token_response["access_token"],
-            "refresh_token": token_response["refresh_token"],
-            "expires_at": datetime.fromtimestamp(token_response["expires_at"]),
-        }
+            token_response = self._client.refresh_access_token(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                refresh_token=refresh_token,
+            )
+            result = {
+                "access_token": token_response["access_token"],
+                "refresh_token": token_response["refresh_token"],
+                "expires_at": datetime.fromtimestamp(token_response["expires_at"]),
+            }
+            _refresh_cache[refresh_token] = (time.monotonic(), result)
+            return result
@@ -1,7 +1,8 @@
 """
 Process Strava activities and enrich with calculated metrics
 """
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Any
 from .metrics import TrainingMetrics
 from .client import StravaDataClient
 
@@ -71,31 +72,45 @@ class StravaDataProcessor:
         activities: List[Dict[str, Any]],
         fetch_streams: bool = False,
         client: StravaDataClient = None,
+        max_workers: int = 8,
+        progress_callback: Callable[[int, int], None] = None,
     ) -> List[Dict[str, Any]]:
         """
         Process multiple activities
 
+        Stream fetches are I/O-bound, so they run through a bounded thread pool
+        instead of a serial fetch-then-sleep loop. The worker cap keeps request
+        bursts inside Strava's rate limits (100 requests per 15 min, 1000/day);
+        stravalib's own limiter backs off if we get close.
+
         Args:
             activities: List of activities from Strava
             fetch_streams: Whether to fetch detailed power streams
             client: Strava client (required if fetch_streams=True)
+            max_workers: Concurrent stream fetches (bounded for rate limits)
+            progress_callback: Optional callable(done, total) for UI progress
 
         Returns:
-            List of processed activities with metrics
+            List of processed activities with metrics (input order preserved)
         """
-        processed_activities = []
-
-        for i, activity in enumerate(activities):
-            streams = None
-            if fetch_streams and client:
-                streams = client.get_activity_streams(activity["id"])
-                # Rate limiting: Strava allows 100 requests per 15min, 1000 per day
-                # Sleep 0.2s between stream requests (max 300 per minute = 5 per second)
-                if i < len(activities) - 1:  # Don't sleep after last activity
-                    import time
-                    time.sleep(0.2)
-
-            processed = self.process_activity(activity, streams)
-            processed_activities.append(processed)
-
-        return processed_activities
+        streams_by_id = {}
+
+        if fetch_streams and client and activities:
+            total = len(activities)
+            done = 0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(client.get_activity_streams, activity["id"]): activity["id"]
+                    for activity in activities
+                }
+                for future in as_completed(futures):
+                    # get_activity_streams catches its own errors and returns empty streams
+                    streams_by_id[futures[future]] = future.result()
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total)
+
+        return [
+            self.process_activity(activity, streams_by_id.get(activity["id"]))
+            for activity in activities
+        ]
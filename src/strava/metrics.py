@@ -142,37 +142,42 @@ class TrainingMetrics:
         if current_date is None:
             current_date = datetime.now()
 
-        # Sort activities by date
-        sorted_activities = sorted(activities_with_tss, key=lambda x: x["start_date"])
+        # Bucket TSS into a daily array over the 90-day lookback via bincount
+        # (one C pass instead of a per-activity accumulation loop)
+        start_date = current_date.date() - timedelta(days=90)
+        if activities_with_tss:
+            offsets = np.array(
+                [(a["start_date"].date() - start_date).days for a in activities_with_tss]
+            )
+            tss = np.array(
+                [a.get("tss", 0) or 0 for a in activities_with_tss], dtype=float
+            )
+            in_window = (offsets >= 0) & (offsets < 90)
+            daily_tss = np.bincount(
+                offsets[in_window], weights=tss[in_window], minlength=90
+            )
+        else:
+            daily_tss = np.zeros(90)
+
+        return TrainingMetrics.calculate_ctl_atl_tsb_vec(daily_tss)
 
-        # Initialize
-        ctl = 0.0  # Chronic Training Load (fitness)
-        atl = 0.0  # Acute Training Load (fatigue)
-
-        # CTL time constant (42 days)
-        ctl_tc = 42
-        # ATL time constant (7 days)
-        atl_tc = 7
-
-        # Calculate daily TSS
-        daily_tss = {}
-        for activity in sorted_activities:
-            date = activity["start_date"].date()
-            tss = activity.get("tss", 0)
-            daily_tss[date] = daily_tss.get(date, 0) + tss
-
-        # Calculate CTL and ATL
-        start_date = current_date.date() - timedelta(days=90)  # Look back 90 days
+    @staticmethod
+    def calculate_ctl_atl_tsb_vec(daily_tss: np.ndarray) -> Dict[str, float]:
+        """
+        Vectorized CTL/ATL/TSB from a daily TSS array
 
-        for i in range(90):
-            date = start_date + timedelta(days=i)
-            tss_today = daily_tss.get(date, 0)
+        The EWMA recurrence `load += (tss - load) / tc` starting from 0 unrolls
+        to a dot product with geometric decay weights, evaluated in C by NumPy.
 
-            # Exponentially weighted moving average
-            ctl = ctl + (tss_today - ctl) / ctl_tc
-            atl = atl + (tss_today - atl) / atl_tc
+        Args:
+            daily_tss: TSS per day, oldest first
 
-        # TSB = CTL - ATL
-        tsb = ctl - atl
+        Returns:
+            Dict with ctl, atl, tsb
+        """
+        n = len(daily_tss)
+        decay_powers = np.arange(n - 1, -1, -1)
+        ctl = float(np.dot(daily_tss, (1 - 1 / 42) ** decay_powers) / 42)
+        atl = float(np.dot(daily_tss, (1 - 1 / 7) ** decay_powers) / 7)
 
-        return {"ctl": round(ctl, 1), "atl": round(atl, 1), "tsb": round(tsb, 1)}
+        return {"ctl": round(ctl, 1), "atl": round(atl, 1), "tsb": round(ctl - atl, 1)}
@@ -0,0 +1,25 @@
+"""
+Cached agent factories shared by the Streamlit pages
+
+Agent construction builds an LLM client (with its TLS session) and compiles a
+LangGraph — too expensive to repeat on every widget-click rerun. These
+factories are process-level singletons via st.cache_resource; the agent
+imports stay inside so pages that never generate anything don't pay them.
+"""
+import streamlit as st
+
+
+@st.cache_resource(show_spinner=False)
+def get_workout_agent():
+    """One WorkoutAgent per process — LLM client and compiled graph survive reruns"""
+    from src.agent.workout_agent import WorkoutAgent
+
+    return WorkoutAgent()
+
+
+@st.cache_resource(show_spinner=False)
+def get_plan_agent():
+    """One PlanAgent per process — same rationale as get_workout_agent"""
+    from src.agent.plan_agent import PlanAgent
+
+    return PlanAgent()
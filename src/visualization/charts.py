@@ -3,27 +3,43 @@ Plotly charts for training visualization
 """
 import plotly.graph_objects as go
 import plotly.express as px
-from typing import List, Dict
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+# orjson serializes figure JSON in C — the serialization sits between chart
+# build and the websocket send on every render
+try:
+    pio.json.config.default_engine = "orjson"
+except ValueError:  # orjson not installed — keep plotly's stdlib engine
+    pass
+from typing import List, Dict, Union
 import pandas as pd
 from datetime import datetime, timedelta
 import numpy as np
 
 
-def create_pmc_chart(activities: List[Dict]) -> go.Figure:
+def _to_dataframe(activities: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+    """Accept a ready DataFrame (e.g. from pd.read_sql_query) or a list of dicts"""
+    if isinstance(activities, pd.DataFrame):
+        return activities.copy()
+    return pd.DataFrame(activities)
+
+
+def create_pmc_chart(activities: Union[pd.DataFrame, List[Dict]]) -> go.Figure:
     """
     Create Performance Management Chart (CTL/ATL/TSB)
 
     Args:
-        activities: List of activities with date and TSS
+        activities: DataFrame or list of activities with date and TSS
 
     Returns:
         Plotly figure
     """
-    if not activities:
+    if activities is None or len(activities) == 0:
         return go.Figure()
 
     # Create dataframe
-    df = pd.DataFrame(activities)
+    df = _to_dataframe(activities)
     df['date'] = pd.to_datetime(df['start_date'])
     df = df.sort_values('date')
 
@@ -96,24 +112,27 @@ def create_pmc_chart(activities: List[Dict]) -> go.Figure:
     return fig
 
 
-def create_weekly_tss_chart(activities: List[Dict]) -> go.Figure:
+def create_weekly_tss_chart(activities: Union[pd.DataFrame, List[Dict]]) -> go.Figure:
     """
     Create weekly TSS bar chart
 
     Args:
-        activities: List of activities
+        activities: DataFrame or list of activities
 
     Returns:
         Plotly figure
     """
-    if not activities:
+    if activities is None or len(activities) == 0:
         return go.Figure()
 
-    df = pd.DataFrame(activities)
-    df['date'] = pd.to_datetime(df['start_date'])
-    df['week'] = df['date'].dt.to_period('W').apply(lambda r: r.start_time)
-
-    weekly_tss = df.groupby('week')['tss'].sum().reset_index()
+    df = _to_dataframe(activities)
+    if 'week' in df.columns:
+        # Already aggregated in SQL (week + summed tss)
+        weekly_tss = df[['week', 'tss']]
+    else:
+        df['date'] = pd.to_datetime(df['start_date'])
+        df['week'] = df['date'].dt.to_period('W').dt.start_time  # vectorized, no per-row apply
+        weekly_tss = df.groupby('week')['tss'].sum().reset_index()
 
     fig = go.Figure(data=[
         go.Bar(
@@ -135,29 +154,33 @@ def create_weekly_tss_chart(activities: List[Dict]) -> go.Figure:
     return fig
 
 
-def create_zone_distribution_chart(activities: List[Dict]) -> go.Figure:
+def create_zone_distribution_chart(activities: Union[pd.DataFrame, List[Dict]]) -> go.Figure:
     """
     Create zone distribution pie chart
 
     Args:
-        activities: List of activities with zone times
+        activities: DataFrame or list of activities with zone times
 
     Returns:
         Plotly figure
     """
-    if not activities:
+    if activities is None or len(activities) == 0:
         return go.Figure()
 
-    df = pd.DataFrame(activities)
+    df = _to_dataframe(activities)
 
-    # Sum time in each zone (convert seconds to hours)
+    # Sum time in each zone (convert seconds to hours) — one contiguous (n, 7)
+    # array and a single vectorized sum instead of seven per-column passes
     zone_columns = ['time_zone1', 'time_zone2', 'time_zone3', 'time_zone4', 'time_zone5', 'time_zone6', 'time_zone7']
-    zone_times = []
-    for col in zone_columns:
-        if col in df.columns:
-            zone_times.append(df[col].sum() / 3600)  # Convert to hours
-        else:
-            zone_times.append(0)
+    present = [col for col in zone_columns if col in df.columns]
+    if present:
+        sums = dict(zip(
+            present,
+            np.nan_to_num(df[present].to_numpy(dtype=float)).sum(axis=0) / 3600,
+        ))
+    else:
+        sums = {}
+    zone_times = [sums.get(col, 0) for col in zone_columns]
 
     # Check if we have any zone data
     total_zone_time = sum(zone_times)
@@ -198,6 +221,108 @@ def create_zone_distribution_chart(activities: List[Dict]) -> go.Figure:
     return fig
 
 
+def create_overview_dashboard_chart(
+    activities: Union[pd.DataFrame, List[Dict]],
+    weekly: Union[pd.DataFrame, List[Dict]],
+) -> go.Figure:
+    """
+    Fuse PMC + weekly TSS + zone distribution into one subplot figure
+
+    One figure means one JSON serialization and one frontend mount instead of
+    three — the layout/config payload is shared across all traces.
+
+    Args:
+        activities: DataFrame or list of activities with start_date and TSS
+            (90-day window for the PMC)
+        weekly: Pre-aggregated weekly DataFrame (week, tss, time_zone1..7)
+
+    Returns:
+        Plotly figure with PMC on top, weekly TSS and zone pie below
+    """
+    fig = make_subplots(
+        rows=2, cols=2,
+        specs=[[{"colspan": 2}, None], [{}, {"type": "domain"}]],
+        subplot_titles=(
+            "Performance Management Chart (Last 90 Days)",
+            "Weekly Training Stress Score",
+            "Power Zone Distribution",
+        ),
+        vertical_spacing=0.12,
+    )
+
+    # ── PMC (row 1, spanning both columns) ────────────────────────────────────
+    if activities is not None and len(activities) > 0:
+        df = _to_dataframe(activities)
+        df['date'] = pd.to_datetime(df['start_date'])
+        df = df.sort_values('date')
+        df['ctl'] = df['tss'].ewm(span=42, adjust=False).mean()
+        df['atl'] = df['tss'].ewm(span=7, adjust=False).mean()
+        df['tsb'] = df['ctl'] - df['atl']
+
+        fig.add_trace(go.Scatter(
+            x=df['date'], y=df['ctl'], name='CTL (Fitness)',
+            line=dict(color='blue', width=2),
+            hovertemplate='<b>CTL</b>: %{y:.1f}<br>%{x}<extra></extra>',
+        ), row=1, col=1)
+        fig.add_trace(go.Scatter(
+            x=df['date'], y=df['atl'], name='ATL (Fatigue)',
+            line=dict(color='red', width=2),
+            hovertemplate='<b>ATL</b>: %{y:.1f}<br>%{x}<extra></extra>',
+        ), row=1, col=1)
+        fig.add_trace(go.Scatter(
+            x=df['date'], y=df['tsb'], name='TSB (Form)',
+            line=dict(color='green', width=2),
+            fill='tozeroy', fillcolor='rgba(0,255,0,0.1)',
+            hovertemplate='<b>TSB</b>: %{y:.1f}<br>%{x}<extra></extra>',
+        ), row=1, col=1)
+        fig.add_hrect(
+            y0=-10, y1=5, fillcolor="lightblue", opacity=0.1,
+            layer="below", line_width=0, row=1, col=1,
+        )
+
+    # ── Weekly TSS bars (row 2, col 1) ────────────────────────────────────────
+    if weekly is not None and len(weekly) > 0:
+        wdf = _to_dataframe(weekly)
+        fig.add_trace(go.Bar(
+            x=wdf['week'], y=wdf['tss'],
+            marker_color='steelblue', showlegend=False,
+            hovertemplate='<b>Week</b>: %{x}<br><b>TSS</b>: %{y:.0f}<extra></extra>',
+        ), row=2, col=1)
+
+        # ── Zone pie (row 2, col 2) ───────────────────────────────────────────
+        zone_columns = ['time_zone1', 'time_zone2', 'time_zone3', 'time_zone4',
+                        'time_zone5', 'time_zone6', 'time_zone7']
+        present = [col for col in zone_columns if col in wdf.columns]
+        if present:
+            sums = dict(zip(
+                present,
+                np.nan_to_num(wdf[present].to_numpy(dtype=float)).sum(axis=0) / 3600,
+            ))
+            zone_times = [sums.get(col, 0) for col in zone_columns]
+            if sum(zone_times) > 0:
+                zone_labels = ['Z1 Recovery', 'Z2 Endurance', 'Z3 Tempo', 'Z4 Threshold',
+                               'Z5 VO2max', 'Z6 Anaerobic', 'Z7 Neuromuscular']
+                colors = ['#90EE90', '#87CEEB', '#FFD700', '#FFA500', '#FF6347',
+                          '#DC143C', '#8B0000']
+                fig.add_trace(go.Pie(
+                    labels=zone_labels, values=zone_times,
+                    marker=dict(colors=colors), showlegend=False,
+                    hovertemplate='<b>%{label}</b><br>%{value:.1f} hours<br>%{percent}<extra></extra>',
+                ), row=2, col=2)
+
+    fig.update_layout(
+        template='plotly_white',
+        height=850,
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    fig.update_yaxes(title_text="Training Load", row=1, col=1)
+    fig.update_yaxes(title_text="TSS", row=2, col=1)
+    fig.update_xaxes(title_text="Week", row=2, col=1)
+
+    return fig
+
+
 def create_power_curve(activities: List[Dict]) -> go.Figure:
     """
     Create power curve (best efforts)
@@ -294,12 +419,12 @@ def create_program_timeline(macro_plan_json: Dict) -> go.Figure:
     return fig
 
 
-def create_planned_vs_actual_tss(week_plans: List) -> go.Figure:
+def create_planned_vs_actual_tss(week_plans: List[Dict]) -> go.Figure:
     """
     Create grouped bar chart comparing planned vs actual TSS per week
 
     Args:
-        week_plans: List of WeekPlan model instances
+        week_plans: List of week dicts (week_number, target_tss, actual_tss, phase)
 
     Returns:
         Plotly figure
@@ -314,10 +439,10 @@ def create_planned_vs_actual_tss(week_plans: List) -> go.Figure:
     phases = []
 
     for wp in week_plans:
-        weeks.append(f"W{wp.week_number}")
-        planned_tss.append(wp.target_tss)
-        actual_tss.append(wp.actual_tss if wp.actual_tss else 0)
-        phases.append(wp.phase)
+        weeks.append(f"W{wp['week_number']}")
+        planned_tss.append(wp["target_tss"])
+        actual_tss.append(wp["actual_tss"] if wp["actual_tss"] else 0)
+        phases.append(wp["phase"])
 
     # Phase colors for bars
     phase_colors = {
@@ -373,23 +498,22 @@ def create_planned_vs_actual_tss(week_plans: List) -> go.Figure:
     return fig
 
 
-def create_program_progress_chart(program, week_plans: List) -> go.Figure:
+def create_program_progress_chart(macro_plan: Dict, initial_ctl: float,
+                                  week_plans: List[Dict]) -> go.Figure:
     """
     Create line chart showing CTL progression (projected vs actual)
 
     Args:
-        program: TrainingProgram model instance
-        week_plans: List of WeekPlan instances
+        macro_plan: Parsed macro plan dict (with week_targets)
+        initial_ctl: CTL at program start
+        week_plans: List of week dicts (week_number, actual_ctl)
 
     Returns:
         Plotly figure
     """
-    import json
-
     if not week_plans:
         return go.Figure()
 
-    macro_plan = json.loads(program.macro_plan_json)
     week_targets = macro_plan.get("week_targets", [])
 
     # Build data for chart
@@ -397,7 +521,7 @@ def create_program_progress_chart(program, week_plans: List) -> go.Figure:
     projected_ctl = []
     actual_ctl = []
 
-    initial_ctl = program.initial_ctl or 50
+    initial_ctl = initial_ctl or 50
 
     for i, wt in enumerate(week_targets):
         week_num = wt["week"]
@@ -414,9 +538,9 @@ def create_program_progress_chart(program, week_plans: List) -> go.Figure:
         projected_ctl.append(proj_ctl)
 
         # Actual CTL from week_plans
-        wp = next((w for w in week_plans if w.week_number == week_num), None)
-        if wp and wp.actual_ctl:
-            actual_ctl.append(wp.actual_ctl)
+        wp = next((w for w in week_plans if w["week_number"] == week_num), None)
+        if wp and wp["actual_ctl"]:
+            actual_ctl.append(wp["actual_ctl"])
         else:
             actual_ctl.append(None)  # Future weeks or no data
 